@@ -0,0 +1,177 @@
+import os
+import json
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from metrics import METRICS
+from paths import DEFAULT_CACHE_DIR, atomic_write
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(DEFAULT_CACHE_DIR, "backfill.json")
+BACKFILL_CHUNK_SIZE = 1000
+
+# Sources whose stored trend was extracted from the title rather than being
+# the title itself (see SourceItem.needs_topic); other rows keep their trend.
+# "Reddit flair (r/...)" rows took their trend from a specific flair.
+EXTRACTED_SOURCES = ("RSS", "Reddit (")
+
+# Per worker process, built once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def needs_topic(source: str) -> bool:
+    # Rows merged with e.g. a Google Trends title keep that title as trend
+    sources = [s.strip() for s in source.split(",") if s.strip()]
+    return bool(sources) and all(s.startswith(EXTRACTED_SOURCES) for s in sources)
+
+
+def _init_worker(use_model: bool, embedding_classifier: bool):
+    """Loads the fetcher, model and classifier once per worker process."""
+    # Imported here: get_trends imports this module for its CLI
+    from get_trends import TrendClassifier, TrendFetcher
+
+    fetcher = TrendFetcher(use_model=use_model)
+    if fetcher.model is not None:
+        # Backfilled texts are mostly unique, and worker processes must not
+        # write the shared on-disk embedding cache concurrently.
+        fetcher.embedding_cache = None
+
+    def encoder(texts):
+        return fetcher.embed([fetcher.clean_title(t) for t in texts])
+
+    use_embeddings = embedding_classifier and fetcher.model
+    _worker["fetcher"] = fetcher
+    _worker["classifier"] = TrendClassifier(encoder=encoder if use_embeddings else None)
+
+
+def _process_chunk(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Re-extracts topics and re-classifies rows; returns the changed rows with
+    their new trend and generation.
+    """
+    fetcher, classifier = _worker["fetcher"], _worker["classifier"]
+    pending = [row for row in rows if needs_topic(row["source"])]
+    topics = fetcher.extract_topics([row["raw_text"] for row in pending])
+    new_trends = {row["id"]: topic for row, topic in zip(pending, topics)}
+    results = classifier.classify_many([row["raw_text"] for row in rows])
+
+    changed = []
+    for row, result in zip(rows, results):
+        trend = new_trends.get(row["id"], row["trend"])
+        if trend != row["trend"] or result["generation"] != row["generation"]:
+            changed.append(dict(row, trend=trend, generation=result["generation"]))
+    return changed
+
+
+class BackfillCheckpoint:
+    """
+    Progress of a backfill: the store, the table (or tab) being processed
+    and the last id whose results are written. Saved atomically after every
+    chunk, removed once every table is done.
+    """
+
+    def __init__(self, path: str, store_id: str):
+        self.path = path
+        self.state = {
+            "store_id": store_id,
+            "table": None,
+            "after": 0,
+            "rows": 0,
+            "updated": 0,
+            "merged": 0,
+        }
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("store_id") == self.state["store_id"]:
+            self.state.update(saved)
+            logger.info(
+                f"Resuming backfill at {saved['table']} id > {saved['after']} "
+                f"({saved['rows']} rows done)."
+            )
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.state))
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _chunks(
+    backend: StorageBackend, checkpoint: BackfillCheckpoint, chunk_size: int
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """(table, rows) chunks from the checkpoint onwards, across all tables."""
+    tables = backend.backfill_tables()
+    start = checkpoint.state["table"]
+    for table in tables[tables.index(start) if start in tables else 0 :]:
+        after = checkpoint.state["after"] if table == checkpoint.state["table"] else 0
+        while True:
+            rows = backend.read_chunk(table, after, chunk_size)
+            if not rows:
+                break
+            after = rows[-1]["id"]
+            yield table, rows
+
+
+def run_backfill(
+    backend: StorageBackend,
+    use_model: bool = True,
+    embedding_classifier: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+) -> Dict[str, Any]:
+    """
+    Re-runs topic extraction and classification over every stored row of
+    a backend that supports it (SQLite and Sheets). Rows are read in id
+    order, chunk_size at a time, and processed on a pool of worker
+    processes that each load the model once; at most two chunks per worker
+    are in flight. Results are written back in order, one transaction (or
+    Sheets batchUpdate) per chunk, and the checkpoint advances after each
+    write, so an interrupted backfill resumes where it stopped.
+    Returns the final progress counters.
+    """
+    checkpoint = BackfillCheckpoint(checkpoint_path, backend.store_id)
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(use_model, embedding_classifier),
+    )
+    in_flight = deque()
+
+    def write_oldest():
+        table, rows, future = in_flight.popleft()
+        with METRICS.timer("backfill_write"):
+            updated, merged = backend.update_extractions(table, future.result())
+        state = checkpoint.state
+        state.update(table=table, after=rows[-1]["id"])
+        state["rows"] += len(rows)
+        state["updated"] += updated
+        state["merged"] += merged
+        checkpoint.save()
+        METRICS.add("backfill_rows", len(rows), table=table)
+        logger.info(
+            f"Backfilled {table} up to id {rows[-1]['id']}: "
+            f"{state['rows']} rows, {state['updated']} updated, "
+            f"{state['merged']} merged."
+        )
+
+    with pool:
+        for table, rows in _chunks(backend, checkpoint, chunk_size):
+            in_flight.append((table, rows, pool.submit(_process_chunk, rows)))
+            if len(in_flight) >= 2 * workers:
+                write_oldest()
+        while in_flight:
+            write_oldest()
+
+    checkpoint.remove()
+    logger.info(f"Backfill complete: {checkpoint.state['rows']} rows.")
+    return checkpoint.state
@@ -0,0 +1,481 @@
+"""
+Offline benchmarks for the trend aggregator.
+
+Replays recorded Google Trends / RSS / Reddit payloads, times feed
+parsing (streaming fast path vs feedparser) on enlarged feeds, times topic
+extraction and classification on synthetic title corpora, and times the
+SheetWriter merge (and archive compaction) against an in-memory Sheets fake
+at several history sizes.
+Results are printed (or written) as JSON; pass --baseline to fail on
+regressions against a previous result file.
+
+    python src/scripts/benchmarks/bench.py --sizes 1000,10000 --output bench.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import datetime
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+# Add the scripts directory to path so we can import from get_trends
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+import get_trends  # noqa: E402
+from get_trends import SheetWriter, TrendClassifier, TrendFetcher  # noqa: E402
+from feeds import parse_rss  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+from seen_posts import SeenPosts  # noqa: E402
+from source_config import HostLimiter  # noqa: E402
+from fake_sheets import FakeSpreadsheet  # noqa: E402
+
+# URL substring -> recorded payload
+FIXTURES = {
+    "trends.google.com/trending/rss": "google_trends_us.xml",
+    "reddit.com/r/GenZ": "reddit_genz_hot.json",
+    "": "rss_news.xml",  # Any other URL is served the RSS fixture
+}
+
+
+class FixtureResponse:
+    def __init__(self, content: bytes):
+        self.status_code = 200
+        self.content = content
+        self.headers: Dict[str, str] = {}
+
+
+class FixtureSession:
+    """Serves recorded payloads instead of hitting the network."""
+
+    def __init__(self):
+        self.payloads = {}
+        for pattern, filename in FIXTURES.items():
+            with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+                self.payloads[pattern] = f.read()
+
+    def get(self, url: str, **kwargs) -> FixtureResponse:
+        for pattern, content in self.payloads.items():
+            if pattern in url:
+                return FixtureResponse(content)
+
+
+# --- Synthetic corpora ---
+
+SUBJECTS = [
+    "Gen Z",
+    "Millennials",
+    "Taylor Swift",
+    "Apple",
+    "TikTok",
+    "Roblox",
+    "Netflix",
+    "Kai Cenat",
+    "The Fed",
+    "Brands",
+    "Parents",
+    "Startups",
+    "Creators",
+    "Bluey",
+    "Fortnite",
+]
+VERBS = [
+    "announces",
+    "can't stop buying",
+    "bets on",
+    "turns to",
+    "rethinks",
+    "launches",
+    "is obsessed with",
+    "pushes back on",
+]
+OBJECTS = [
+    "new tour dates",
+    "AI features",
+    "interest rates",
+    "the housing market",
+    "energy drinks",
+    "viral dress trends",
+    "skibidi memes",
+    "remote work",
+    "90s nostalgia",
+    "live sports",
+    "coffee subscriptions",
+    "brand deals",
+]
+SITES = ["CNBC", "TechCrunch", "Marketing Dive", "The Verge"]
+
+
+def synthetic_titles(n: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    titles = []
+    for i in range(n):
+        title = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+        if rng.random() < 0.3:
+            title += f" in {2020 + i % 7}"
+        if rng.random() < 0.5:
+            title += f" - {rng.choice(SITES)}"
+        titles.append(title)
+    return titles
+
+
+def synthetic_trends(titles: List[str], date: str) -> List[Dict[str, Any]]:
+    classifier = TrendClassifier()
+    generations = classifier.classify_many(titles)
+    return [
+        {
+            "date": date,
+            "source": ["RSS", "Google Trends", "Reddit (r/GenZ)"][i % 3],
+            "trend": TrendFetcher.clean_title(title),
+            "url": f"https://news.example.com/{i}",
+            "raw_text": title,
+            "trend_score": (i * 37) % 5000,
+            "metric_label": "News Feature",
+            "generation": result["generation"],
+        }
+        for i, (title, result) in enumerate(zip(titles, generations))
+    ]
+
+
+def synthetic_history(rows_per_tab: int) -> Dict[str, List[List[Any]]]:
+    """Sheet contents with rows_per_tab past trends in every generation tab."""
+    tabs = {}
+    for t, tab in enumerate(get_trends.GENERATION_TABS):
+        rows = [list(get_trends.HEADER)]
+        for i in range(rows_per_tab):
+            day = 1 + (i // 100) % 28
+            rows.append(
+                [
+                    f"2026-{1 + (i // 2800) % 9:02d}-{day:02d}",
+                    f"{tab} topic {i}",
+                    "RSS",
+                    f"https://news.example.com/{t}/{i}",
+                    f"{tab} topic {i} headline",
+                    str((i * 13) % 5000),
+                    "News Feature",
+                ]
+            )
+        tabs[tab] = rows
+    return tabs
+
+
+# --- Harness ---
+
+
+def measure(
+    run: Callable[[Any], Any], setup: Callable[[], Any] = lambda: None, repeat: int = 3
+) -> float:
+    """Best wall time of run(setup()) over repeat rounds; setup is untimed."""
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(benchmark: str, variant: str, size: int, seconds: float, **extra):
+    return {
+        "benchmark": benchmark,
+        "variant": variant,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "items_per_second": round(size / seconds, 1) if seconds else None,
+        **extra,
+    }
+
+
+def reset_seen(fetcher: TrendFetcher) -> TrendFetcher:
+    """Forgets ingested Reddit posts so every round parses the full page."""
+    fetcher.seen_posts = SeenPosts(path=None)
+    return fetcher
+
+
+def bench_sources(repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    fetcher = TrendFetcher(use_model=False, http_cache=HTTPCache(tempfile.mkdtemp()))
+    fetcher._session = FixtureSession()
+    fetcher.host_limiter = HostLimiter()  # No request spacing offline
+    sources = {
+        "google_trends": fetcher.iter_google_trends,
+        "rss": lambda: fetcher.iter_rss_feed("https://news.example.com/feed/"),
+        "reddit": lambda: reset_seen(fetcher).iter_reddit("GenZ"),
+    }
+    for name, factory in sources.items():
+        size = len(list(factory()))
+        seconds = measure(lambda _: list(factory()), repeat=repeat)
+        results.append(result("fetch_parse", name, size, seconds))
+    return results
+
+
+def synthetic_feed(filename: str, size: int) -> bytes:
+    """A recorded feed with its items repeated until it holds size items."""
+    with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+        content = f.read()
+    items = re.findall(rb"<item>.*?</item>", content, re.S)
+    head = content[: content.index(b"<item>")]
+    tail = content[content.rindex(b"</item>") + len(b"</item>") :]
+    return head + b"".join(items[i % len(items)] for i in range(size)) + tail
+
+
+def bench_feeds(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """Parses enlarged feeds keeping the source's usual item limit."""
+    feedparser = get_trends._lazy_import("feedparser")
+    parsers = {
+        "fast": parse_rss,
+        "feedparser": lambda content, limit: feedparser.parse(content).entries[:limit],
+    }
+    results = []
+    for filename, limit in (("google_trends_us.xml", 20), ("rss_news.xml", 10)):
+        for size in sizes:
+            content = synthetic_feed(filename, size)
+            for variant, parse in parsers.items():
+                seconds = measure(lambda _: parse(content, limit), repeat=repeat)
+                tracemalloc.start()
+                parse(content, limit)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.append(
+                    result(
+                        f"parse_{filename.split('.')[0]}",
+                        variant,
+                        size,
+                        seconds,
+                        peak_bytes=peak,
+                    )
+                )
+    return results
+
+
+def bench_extract(
+    titles: List[str], sizes: List[int], repeat: int, with_model: bool
+) -> List[Dict[str, Any]]:
+    results = []
+    fetcher = TrendFetcher(use_model=False)
+    for size in sizes:
+        seconds = measure(
+            lambda _: fetcher.extract_topics(titles[:size]), repeat=repeat
+        )
+        results.append(result("extract_topic", "heuristic", size, seconds))
+
+    if with_model:
+        fetcher = TrendFetcher()
+        if fetcher.model is None:
+            logging.warning("Model unavailable, skipping semantic extraction.")
+            return results
+        fetcher.embedding_cache = None  # Measure encoding, not cache hits
+        for size in sizes:
+            seconds = measure(
+                lambda _: fetcher.extract_topics(titles[:size]), repeat=repeat
+            )
+            results.append(result("extract_topic", "semantic", size, seconds))
+    return results
+
+
+def bench_classify(
+    titles: List[str], sizes: List[int], repeat: int
+) -> List[Dict[str, Any]]:
+    classifier = TrendClassifier()
+    return [
+        result(
+            "classify",
+            "keywords",
+            size,
+            measure(lambda _: classifier.classify_many(titles[:size]), repeat=repeat),
+        )
+        for size in sizes
+    ]
+
+
+def bench_sync(
+    titles: List[str], sizes: List[int], repeat: int, run_size: int = 200
+) -> List[Dict[str, Any]]:
+    results = []
+    # Half of the run repeats keys already in the sheet, half is new
+    new_trends = synthetic_trends(titles[:run_size], "2026-10-16")
+    for size in sizes:
+        history = synthetic_history(size)
+        for tab, rows in history.items():
+            for i, t in enumerate(new_trends[: run_size // 2]):
+                if t["generation"] == tab and i < len(rows) - 1:
+                    t_row = rows[i + 1]
+                    t_row[0], t_row[1] = t["date"], t["trend"]
+
+        def setup():
+            sheet = FakeSpreadsheet()
+            for tab, rows in history.items():
+                sheet.load(tab, rows)
+            # No retention: the synthetic dates would otherwise all be past
+            # the cutoff and every round would archive (see bench_archive)
+            writer = SheetWriter(retention_days=0)
+            writer.sheet = sheet
+            return writer
+
+        for mode in ("delta", "rewrite"):
+            writer = setup()
+            writer.sync_trends(new_trends, mode=mode)
+            seconds = measure(
+                lambda w: w.sync_trends(new_trends, mode=mode), setup, repeat
+            )
+            results.append(
+                result(
+                    "sync_trends",
+                    mode,
+                    size,
+                    seconds,
+                    run_size=run_size,
+                    api_calls=sum(writer.sheet.calls.values()),
+                )
+            )
+    return results
+
+
+def bench_archive(
+    titles: List[str], sizes: List[int], repeat: int, run_size: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Times a sync that moves half of every tab into monthly archive tabs.
+    Dates are relative to today, so the expired share doesn't drift.
+    """
+    results = []
+    today = datetime.date.today()
+    new_trends = synthetic_trends(titles[:run_size], today.isoformat())
+    for size in sizes:
+        history = synthetic_history(size)
+        for rows in history.values():
+            for i, row in enumerate(rows[1:]):
+                age = 1 + i % 20 if i % 2 else 40 + i % 20  # Retention is 30 days
+                row[0] = (today - datetime.timedelta(days=age)).isoformat()
+
+        def setup():
+            sheet = FakeSpreadsheet()
+            for tab, rows in history.items():
+                sheet.load(tab, rows)
+            writer = SheetWriter(retention_days=30)
+            writer.sheet = sheet
+            return writer
+
+        writer = setup()
+        writer.sync_trends(new_trends, mode="delta")
+        seconds = measure(
+            lambda w: w.sync_trends(new_trends, mode="delta"), setup, repeat
+        )
+        results.append(
+            result(
+                "sync_archive",
+                "delta",
+                size,
+                seconds,
+                run_size=run_size,
+                api_calls=sum(writer.sheet.calls.values()),
+            )
+        )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline_path: str, tolerance: float
+) -> List[str]:
+    """Returns a message per benchmark slower than baseline by > tolerance."""
+    with open(baseline_path) as f:
+        baseline = {
+            (r["benchmark"], r["variant"], r["size"]): r["seconds"]
+            for r in json.load(f)["results"]
+        }
+    regressions = []
+    for r in results:
+        before = baseline.get((r["benchmark"], r["variant"], r["size"]))
+        if before and r["seconds"] > before * (1 + tolerance):
+            regressions.append(
+                f"{r['benchmark']}/{r['variant']}/{r['size']}: "
+                f"{before:.4f}s -> {r['seconds']:.4f}s"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated corpus / history sizes.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of rounds.")
+    parser.add_argument(
+        "--with-model",
+        action="store_true",
+        help="Also time semantic extraction (needs sentence-transformers).",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    parser.add_argument("--baseline", help="Previous JSON result to compare with.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown vs baseline before failing (0.25 = 25%%).",
+    )
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    titles = synthetic_titles(max(sizes))
+
+    results = bench_sources(args.repeat)
+    results += bench_feeds(sizes, args.repeat)
+    results += bench_extract(titles, sizes, args.repeat, args.with_model)
+    results += bench_classify(titles, sizes, args.repeat)
+    results += bench_sync(titles, sizes, args.repeat)
+    results += bench_archive(titles, sizes, args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
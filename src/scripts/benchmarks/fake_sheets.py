@@ -0,0 +1,103 @@
+import re
+from typing import Any, Dict, List
+
+
+def _a1_to_rowcol(cell: str):
+    """(row, col) of a cell; row is None for a whole column such as "G"."""
+    match = re.match(r"([A-Z]+)(\d*)", cell)
+    col = 0
+    for char in match.group(1):
+        col = col * 26 + ord(char) - ord("A") + 1
+    return int(match.group(2)) if match.group(2) else None, col
+
+
+def _split_range(range_name: str):
+    """Splits "'Gen Z'!A2:G9" into ("Gen Z", "A2", "G9"); end is "" for one cell."""
+    title, _, cells = range_name.rpartition("!")
+    start, _, end = cells.partition(":")
+    return title.strip("'").replace("''", "'"), start, end
+
+
+class FakeWorksheet:
+    def __init__(self, sheet_id: int, title: str, row_count: int = 1000):
+        self.id = sheet_id
+        self.title = title
+        self.row_count = row_count
+        self.rows: List[List[Any]] = []
+
+
+class FakeSpreadsheet:
+    """
+    In-memory stand-in for the subset of gspread.Spreadsheet that
+    SheetWriter uses. Counts API calls per method so benchmarks can report
+    round-trips alongside timings.
+    """
+
+    def __init__(self):
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def load(self, title: str, rows: List[List[Any]]):
+        """Seeds a tab with rows (header included) without counting calls."""
+        worksheet = FakeWorksheet(len(self._worksheets) + 1, title)
+        worksheet.rows = [list(row) for row in rows]
+        worksheet.row_count = max(worksheet.row_count, len(rows))
+        self._worksheets[title] = worksheet
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._count("worksheets")
+        return list(self._worksheets.values())
+
+    def batch_update(self, body: Dict[str, Any]):
+        self._count("batch_update")
+        for request in body["requests"]:
+            if "addSheet" in request:
+                properties = request["addSheet"]["properties"]
+                self._worksheets[properties["title"]] = FakeWorksheet(
+                    len(self._worksheets) + 1,
+                    properties["title"],
+                    properties.get("gridProperties", {}).get("rowCount", 1000),
+                )
+            elif "appendDimension" in request:
+                dimension = request["appendDimension"]
+                for worksheet in self._worksheets.values():
+                    if worksheet.id == dimension["sheetId"]:
+                        worksheet.row_count += dimension["length"]
+
+    def _values(self, range_name: str) -> Dict[str, Any]:
+        title, start, end = _split_range(range_name)
+        row, col = _a1_to_rowcol(start)
+        end_row = _a1_to_rowcol(end)[0] if end else row
+        rows = [
+            [str(value) for value in r[col - 1 :]]
+            for r in self._worksheets[title].rows[row - 1 : end_row]
+        ]
+        while rows and not any(rows[-1]):
+            rows.pop()  # Sheets trims trailing empty rows
+        return {"range": range_name, "values": rows} if rows else {}
+
+    def values_get(self, range_name: str, params: Any = None) -> Dict[str, Any]:
+        self._count("values_get")
+        return self._values(range_name)
+
+    def values_batch_get(self, ranges: List[str], params: Any = None):
+        self._count("values_batch_get")
+        return {"valueRanges": [self._values(r) for r in ranges]}
+
+    def values_batch_update(self, body: Dict[str, Any]):
+        self._count("values_batch_update")
+        for data in body["data"]:
+            title, start, _ = _split_range(data["range"])
+            worksheet = self._worksheets[title]
+            row, col = _a1_to_rowcol(start)
+            if row + len(data["values"]) - 1 > worksheet.row_count:
+                raise ValueError(f"Range {data['range']} exceeds grid limits")
+            for offset, values in enumerate(data["values"]):
+                while len(worksheet.rows) < row + offset:
+                    worksheet.rows.append([])
+                target = worksheet.rows[row + offset - 1]
+                target.extend([""] * (col - 1 + len(values) - len(target)))
+                target[col - 1 : col - 1 + len(values)] = values
@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from paths import DEFAULT_CACHE_DIR, atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CIRCUITS_PATH = os.path.join(DEFAULT_CACHE_DIR, "circuits.json")
+
+
+class Budget:
+    """
+    A time budget ending at a fixed monotonic deadline.
+    A budget created with a parent never outlasts it, so per-source budgets
+    stay inside the run deadline.
+    """
+
+    def __init__(self, seconds: float, parent: Optional["Budget"] = None):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        if parent is not None:
+            self.deadline = min(self.deadline, parent.deadline)
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+class CircuitBreaker:
+    """
+    Skips sources that keep failing.
+    After failures consecutive failed runs a source's circuit opens for
+    cooldown seconds, doubling with every further failure (at most 16x).
+    Once the cooldown passes one attempt is let through: success closes
+    the circuit, failure reopens it. State is kept in a JSON file so
+    separate cron runs share it.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CIRCUITS_PATH,
+        failures: int = 3,
+        cooldown: float = 30 * 60,
+    ):
+        self.path = path
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path) as f:
+                self._state = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def allow(self, name: str) -> bool:
+        with self._lock:
+            state = self._state.get(name)
+            return (
+                state is None
+                or state["failures"] < self.failures
+                or time.time() >= state["open_until"]
+            )
+
+    def record(self, name: str, ok: bool):
+        with self._lock:
+            if ok:
+                if self._state.pop(name, None):
+                    logger.info(f"Circuit closed for {name}.")
+                return
+            state = self._state.setdefault(name, {"failures": 0, "open_until": 0})
+            state["failures"] += 1
+            if state["failures"] >= self.failures:
+                backoff = 2 ** min(state["failures"] - self.failures, 4)
+                state["open_until"] = time.time() + self.cooldown * backoff
+                logger.warning(
+                    f"Circuit open for {name} after {state['failures']} failures, "
+                    f"skipping it for {self.cooldown * backoff / 60:.0f} min."
+                )
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._state)
+        try:
+            atomic_write(self.path, data)
+        except OSError as e:
+            logger.warning(f"Failed to save circuit breaker state: {e}")
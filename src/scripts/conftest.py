@@ -0,0 +1,59 @@
+import sys
+import os
+
+import pytest
+
+# Tests import the scripts and the benchmark fakes as top-level modules
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [SCRIPTS_DIR, os.path.join(SCRIPTS_DIR, "benchmarks")]
+
+from budget import CircuitBreaker  # noqa: E402
+from get_trends import TrendFetcher  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+from seen_posts import SeenPosts  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    def __bool__(self):
+        # Like requests.Response, falsy for error statuses
+        return self.status_code < 400
+
+
+class FakeSession:
+    """Replays a scripted list of responses (or exceptions to raise)."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def get(self, url, timeout=None, **kwargs):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def make_fetcher(tmp_path):
+    """
+    Builds a heuristics-only TrendFetcher whose session replays replies and
+    whose caches live under tmp_path (seen posts in memory only).
+    """
+
+    def make(replies=()):
+        fetcher = TrendFetcher(
+            use_model=False, http_cache=HTTPCache(str(tmp_path / "http"))
+        )
+        fetcher._session = FakeSession(replies)
+        fetcher.circuits = CircuitBreaker(path=str(tmp_path / "circuits.json"))
+        fetcher.seen_posts = SeenPosts(path=None)
+        fetcher._source.failed = False
+        return fetcher
+
+    return make
@@ -0,0 +1,69 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import METRICS
+from pipeline import run_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+def run_daemon(
+    fetcher,
+    classifier,
+    on_results: Callable[[List[Dict[str, Any]]], Any],
+    stop: threading.Event,
+    max_workers: int = 16,
+    deadline: Optional[float] = None,
+):
+    """
+    Polls every source on its own interval until stop is set.
+    Each tick streams the sources that are due through run_pipeline and
+    hands their records to on_results, so the model, HTTP session and
+    caches of fetcher stay warm between polls. Every tick gets a fresh run
+    deadline (deadline seconds, or run_deadline from sources.json) and
+    resets METRICS, so each report covers one tick. A tick in
+    progress when stop is set still finishes and is delivered.
+    """
+    schedule = fetcher.scheduled_sources()
+    if not schedule:
+        logger.warning("No sources configured, nothing to poll.")
+        return
+    next_due = {name: 0.0 for name, _, _ in schedule}  # monotonic seconds
+    logger.info(f"Daemon polling {len(schedule)} sources.")
+
+    while not stop.is_set():
+        now = time.monotonic()
+        due = [
+            (name, factory, interval)
+            for name, factory, interval in schedule
+            if next_due[name] <= now
+        ]
+        if not due:
+            stop.wait(min(next_due.values()) - now)
+            continue
+
+        for name, _, interval in due:
+            next_due[name] = now + interval
+        logger.info(f"Polling {len(due)} due sources...")
+        # Each tick's run report covers that tick only
+        METRICS.reset()
+        trends = []
+        fetcher.start_run(deadline)
+        run_pipeline(
+            fetcher,
+            classifier,
+            trends.extend,
+            max_workers=max_workers,
+            sources=[(name, factory) for name, factory, _ in due],
+        )
+        if trends:
+            try:
+                on_results(trends)
+            except Exception as e:
+                logger.error(f"Failed to deliver {len(trends)} trends: {e}")
+                # Fetch this tick's Reddit posts again next time
+                fetcher.seen_posts.discard_pending()
+
+    logger.info("Daemon stopped.")
@@ -0,0 +1,95 @@
+import re
+import zlib
+import logging
+from typing import List, Dict, Any
+
+import numpy as np
+
+from storage import merge_sources
+
+logger = logging.getLogger(__name__)
+
+# MinHash / LSH settings: 16 bands of 2 rows catch pairs with a token
+# Jaccard similarity of ~0.6 with >99% probability.
+NUM_PERM = 32
+BANDS = 16
+PRIME = (1 << 31) - 1
+# Max bucket members a newcomer is verified against, keeps hot buckets linear
+MAX_BUCKET_CHECKS = 50
+
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, PRIME, size=NUM_PERM, dtype=np.int64)
+_B = _rng.integers(0, PRIME, size=NUM_PERM, dtype=np.int64)
+
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(re.findall(r"\w+", (text or "").lower()))
+
+
+def _signature(tokens: frozenset) -> np.ndarray:
+    hashes = np.array([zlib.crc32(t.encode("utf-8")) for t in tokens], dtype=np.int64)
+    hashes %= PRIME
+    return ((np.outer(_A, hashes) + _B[:, None]) % PRIME).min(axis=1)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b)
+
+
+def cluster_trends(
+    trends: List[Dict[str, Any]], threshold: float = 0.6
+) -> List[Dict[str, Any]]:
+    """
+    Merges near-duplicate trends of the same date and generation, e.g.
+    "Taylor Swift Tour" and "taylor swift tour dates". Runs after
+    classification, so trends of different generations never merge and
+    each keeps its place in its own tab.
+    Candidates are blocked with MinHash LSH over word tokens and confirmed
+    by exact Jaccard similarity >= threshold, so cost stays near-linear.
+    Each cluster keeps its highest-scoring record, with the sources of all
+    members merged and the highest score.
+    """
+    parent = list(range(len(trends)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    tokens = [_tokens(t.get("trend")) for t in trends]
+    rows = NUM_PERM // BANDS
+    buckets: Dict[tuple, List[int]] = {}
+    for i, t in enumerate(trends):
+        if not tokens[i]:
+            continue
+        signature = _signature(tokens[i])
+        for band in range(BANDS):
+            key = (t["date"], t.get("generation"), band) + tuple(
+                signature[band * rows : (band + 1) * rows]
+            )
+            members = buckets.setdefault(key, [])
+            for j in members[:MAX_BUCKET_CHECKS]:
+                if find(i) != find(j) and _jaccard(tokens[i], tokens[j]) >= threshold:
+                    parent[find(i)] = find(j)
+            members.append(i)
+
+    clusters: Dict[int, List[Dict[str, Any]]] = {}
+    for i, t in enumerate(trends):
+        clusters.setdefault(find(i), []).append(t)
+
+    merged = []
+    for members in clusters.values():
+        if len(members) == 1:
+            merged.append(members[0])
+            continue
+        best = max(members, key=lambda t: t.get("trend_score", 0)).copy()
+        for t in members:
+            best["source"] = merge_sources(best["source"], t["source"])
+            if not best.get("url") and t.get("url"):
+                best["url"] = t["url"]
+        merged.append(best)
+
+    if len(merged) < len(trends):
+        logger.info(f"Clustered {len(trends)} trends into {len(merged)}.")
+    return merged
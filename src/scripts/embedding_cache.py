@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from paths import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Size-bounded, on-disk cache of text embeddings.
+    Vectors live in a memory-mapped float32 array (vectors.f32); index.json maps
+    the content hash of each text to its row and keeps LRU order for eviction.
+    """
+
+    def __init__(self, path: str, namespace: str, capacity: int = 20000):
+        self.path = path
+        self.namespace = namespace  # e.g. the model name, part of every key
+        self.capacity = capacity
+        self.dim = None
+        self.hits = 0
+        self.misses = 0
+        # key -> row, least recently used first
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._vectors = None
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.path, "index.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self._index_path) or not os.path.exists(
+            self._vectors_path
+        ):
+            return
+        try:
+            with open(self._index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache index: {e}")
+            return
+
+        if (
+            index.get("namespace") != self.namespace
+            or index.get("capacity") != self.capacity
+        ):
+            logger.info("Embedding cache settings changed, starting fresh.")
+            return
+
+        self.dim = index["dim"]
+        self._slots = OrderedDict((key, slot) for key, slot in index["slots"])
+        self._vectors = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(self.capacity, self.dim),
+        )
+
+    def _allocate(self, dim: int):
+        os.makedirs(self.path, exist_ok=True)
+        self.dim = dim
+        self._slots.clear()
+        self._vectors = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="w+",
+            shape=(self.capacity, dim),
+        )
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self._key(text)
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        self._slots.move_to_end(key)
+        return np.array(self._vectors[slot])
+
+    def put(self, text: str, vector: np.ndarray):
+        if self._vectors is None or len(vector) != self.dim:
+            self._allocate(len(vector))
+
+        key = self._key(text)
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self._slots) < self.capacity:
+                slot = len(self._slots)
+            else:
+                # Evict the least recently used entry and reuse its row
+                _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+        else:
+            self._slots.move_to_end(key)
+        self._vectors[slot] = vector
+
+    def encode(
+        self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns embeddings for texts, calling encode_fn once with the
+        unique texts that are not cached yet.
+        """
+        vectors = [self.get(t) for t in texts]
+        missed = sum(v is None for v in vectors)
+        self.hits += len(texts) - missed
+        self.misses += missed
+
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+
+        if missing:
+            encoded = np.asarray(encode_fn(missing), dtype=np.float32)
+            fresh = dict(zip(missing, encoded))
+            for text, vector in fresh.items():
+                self.put(text, vector)
+            vectors = [fresh[t] if v is None else v for t, v in zip(texts, vectors)]
+
+        return np.vstack(vectors)
+
+    def save(self):
+        """Flushes vectors and atomically rewrites the index."""
+        if self._vectors is None:
+            return
+        self._vectors.flush()
+        index = {
+            "namespace": self.namespace,
+            "capacity": self.capacity,
+            "dim": self.dim,
+            "slots": list(self._slots.items()),
+        }
+        atomic_write(self._index_path, json.dumps(index))
+
+    def stats(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{len(self._slots)}/{self.capacity} entries"
+        )
@@ -0,0 +1,101 @@
+import io
+import logging
+import xml.etree.ElementTree as ET
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Child elements of an RSS 2.0 <item> and the feedparser keys they map to
+ITEM_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "description": "summary",
+    "pubDate": "published",
+    "guid": "id",
+}
+
+
+class FeedEntry(dict):
+    """
+    A feed item with the same dict and attribute access as feedparser's
+    entries (entry.title, entry.get("ht_approx_traffic"), entry.tags).
+    """
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+class UnsupportedFeed(Exception):
+    """The payload is not a well-formed RSS 2.0 document."""
+
+
+def _local_name(tag: str):
+    """Splits "{uri}name" into (uri, name); plain tags have no uri."""
+    if tag[:1] == "{":
+        uri, _, name = tag[1:].partition("}")
+        return uri, name
+    return None, tag
+
+
+def _text(elem: ET.Element) -> str:
+    return (elem.text or "").strip()
+
+
+def _parse_item(item: ET.Element, prefixes: dict) -> FeedEntry:
+    entry = FeedEntry(tags=[])
+    for child in item:
+        uri, name = _local_name(child.tag)
+        if uri is None:
+            if name == "category":
+                entry["tags"].append(
+                    {"term": _text(child), "scheme": child.get("domain"), "label": None}
+                )
+            elif name in ITEM_FIELDS:
+                entry[ITEM_FIELDS[name]] = _text(child)
+        elif len(child) == 0 and uri in prefixes:
+            # Simple namespaced values, e.g. <ht:approx_traffic> -> ht_approx_traffic
+            entry.setdefault(f"{prefixes[uri]}_{name}", _text(child))
+    entry.setdefault("title", "")
+    entry.setdefault("link", "")
+    return entry
+
+
+def parse_rss(content: bytes, limit: Optional[int] = None) -> List[FeedEntry]:
+    """
+    Streams the <item> elements of an RSS 2.0 document with iterparse and
+    stops after limit items, so the rest of the payload is never parsed
+    into elements. Each item is cleared once converted, keeping memory
+    flat for long feeds. Raises UnsupportedFeed for other root elements
+    and for malformed XML.
+    """
+    if limit is not None and limit <= 0:
+        return []
+    try:
+        return _parse_items(content, limit)
+    except ET.ParseError as e:
+        raise UnsupportedFeed(e) from e
+
+
+def _parse_items(content: bytes, limit: Optional[int]) -> List[FeedEntry]:
+    entries = []
+    prefixes = {}  # namespace uri -> first prefix declared for it
+    root = None
+    events = ET.iterparse(io.BytesIO(content), events=("start", "start-ns", "end"))
+    for event, value in events:
+        if event == "start-ns":
+            prefix, uri = value
+            prefixes.setdefault(uri, prefix)
+        elif event == "start":
+            if root is None:
+                root = value
+                if root.tag != "rss":
+                    raise UnsupportedFeed(root.tag)
+        elif value.tag == "item":
+            entries.append(_parse_item(value, prefixes))
+            value.clear()
+            if limit is not None and len(entries) >= limit:
+                break
+    return entries
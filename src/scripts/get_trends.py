@@ -1,22 +1,66 @@
 import os
+import argparse
 import time
+
+_MODULE_START = time.perf_counter()
+
+import importlib
+import sys
 import json
 import logging
 import datetime
+import random
 import re
-from typing import List, Dict, Any
+import signal
+import threading
+from functools import partial
+from typing import (
+    List,
+    Dict,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 # Load env from web directory
 env_path = os.path.join(os.path.dirname(__file__), "../../src/web/.env.local")
 loaded = load_dotenv(env_path, verbose=True)
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import feedparser
-import requests
-from pytrends.request import TrendReq
-
+from backfill import BACKFILL_CHUNK_SIZE, DEFAULT_CHECKPOINT_PATH, run_backfill
+from budget import Budget, CircuitBreaker
+from daemon import run_daemon
+from feeds import UnsupportedFeed, parse_rss
+from http_cache import HTTPCache
+from metrics import DEFAULT_REPORT_PATH, DEFAULT_TEXTFILE_PATH, METRICS
+from paths import DEFAULT_CACHE_DIR
+from source_config import (
+    DEFAULT_GENERIC_FLAIRS,
+    DEFAULT_REDDIT_PAGES,
+    SOURCES_PATH,
+    HostLimiter,
+    load_sources,
+)
+from pipeline import run_pipeline
+from records import TrendBatch, TrendRecord
+from seen_posts import SeenPosts
+from snapshot import DEFAULT_SNAPSHOT_DIR, SNAPSHOT_TOP_N, publish_snapshot
+from storage import (
+    DEFAULT_DB_PATH,
+    RETENTION_DAYS,
+    SQLiteBackend,
+    StorageBackend,
+    archive_month,
+    is_expired,
+    merge_sources,
+    normalize_trend,
+    retention_cutoff,
+)
 
 # Configure Logging
 logging.basicConfig(
@@ -40,23 +84,194 @@ if CREDS_JSON:
 else:
     logger.error("CREDS_JSON is Missing or Empty!")
 
+# Seconds spent per startup phase (module import, lazy imports, model load)
+STARTUP_TIMINGS: Dict[str, float] = {}
+_IMPORT_LOCK = threading.RLock()
+
+
+def _lazy_import(name: str):
+    """
+    Imports a heavy dependency on first use and records how long it took,
+    so sources that never need e.g. gspread or pytrends never pay for them.
+    """
+    # Locked so a thread never sees a module another thread is still importing
+    with _IMPORT_LOCK:
+        module = sys.modules.get(name)
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            STARTUP_TIMINGS[f"import {name}"] = time.perf_counter() - start
+    return module
+
+
+def log_startup_timings():
+    report = ", ".join(
+        f"{phase}={secs:.2f}s" for phase, secs in STARTUP_TIMINGS.items()
+    )
+    logger.info(f"Startup timing: {report}")
+
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), "keywords.json")
+
+# Minimum cosine similarity to a generation centroid for embedding routing
+EMBEDDING_THRESHOLD = 0.35
+
+HEADER = ["Date", "Trend", "Source", "URL", "Raw Text", "Score", "Metric"]
+GENERATION_TABS = ["Gen Z", "Millennials", "Gen Alpha", "General"]
+# Fastest-growing trends across generations, rewritten every run
+RISING_TAB = "Rising"
+
+# "delta" appends/patches only changed rows, "rewrite" rewrites whole tabs
+SYNC_MODE = os.environ.get("SYNC_MODE", "delta")
+
+# Sheets API quota (429) and transient errors are retried with backoff
+SHEETS_MAX_RETRIES = 5
+RETRYABLE_STATUS = {429, 500, 502, 503}
+# Source HTTP requests retry the same errors, plus connection failures and
+# timeouts, with jittered backoff while their time budget lasts
+HTTP_MAX_RETRIES = 3
+
+
+class SourceItem(NamedTuple):
+    """A record yielded by a source; needs_topic marks titles still to extract."""
+
+    record: "TrendRecord"
+    needs_topic: bool = False
+    entry: Any = None
+
+
+def _geo_label(name: str, geo: str) -> str:
+    # US keeps the bare label so rows from before multi-geo fetching still merge
+    return name if geo == "US" else f"{name} ({geo})"
+
 
 class TrendFetcher:
-    def __init__(self):
-        self.trends = []
-        self.model = None
+    def __init__(
+        self,
+        use_model: bool = True,
+        http_cache: Optional[HTTPCache] = None,
+        sources_path: str = SOURCES_PATH,
+    ):
+        # Geos, feeds and subreddits to fetch, with item and rate limits
+        self.config = load_sources(sources_path)
+        self._lock = threading.Lock()
+
+        # Shared pooled HTTP session (created on first request)
+        # + per-host concurrency and request spacing limits
+        self._session = None
+        self.host_limiter = HostLimiter(self.config["hosts"])
+        # Run deadline (see start_run) and the budget of the source running
+        # on the current thread; sources that keep failing are skipped
+        self.deadline: Optional[Budget] = None
+        self._source = threading.local()
+        self.circuits = CircuitBreaker(**self.config["circuit_breaker"])
+        # Reddit posts ingested by earlier runs, skipped when seen again
+        self.seen_posts = SeenPosts()
+        # ETag/Last-Modified validators and parsed payloads of past responses
+        self.http_cache = http_cache or HTTPCache()
+
+        # The model is loaded on first use; use_model=False keeps heuristics only
+        self.use_model = use_model
+        self._model = None
+        self._model_loaded = False
+        self._model_lock = threading.Lock()
+        self._embed_lock = threading.Lock()
+        self._candidate_analyzer = None
+        # n-gram candidates embedded so far this run, shared by all titles;
+        # built on first semantic extraction
+        self.candidate_vocabulary = None
+        self.embedding_cache = None
+
+    @property
+    def model(self):
+        if not self._model_loaded:
+            with self._model_lock:
+                if not self._model_loaded:
+                    self._load_model()
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+        self._model_loaded = True
+
+    def _load_model(self):
+        self._model_loaded = True
+        if not self.use_model:
+            logger.info("Model disabled. Using heuristics only.")
+            return
+        start = time.perf_counter()
         try:
-            from sentence_transformers import SentenceTransformer
+            SentenceTransformer = _lazy_import(
+                "sentence_transformers"
+            ).SentenceTransformer
 
             # Load a small, fast model
-            self.model = SentenceTransformer("all-MiniLM-L6-v2")
+            self._model = SentenceTransformer(MODEL_NAME)
             logger.info("SentenceTransformer model loaded successfully.")
+            embedding_cache = _lazy_import("embedding_cache")
+            self.embedding_cache = embedding_cache.EmbeddingCache(
+                os.path.join(DEFAULT_CACHE_DIR, "embeddings"),
+                namespace=MODEL_NAME,
+            )
         except ImportError:
             logger.warning(
                 "sentence-transformers not found. Falling back to heuristics."
             )
         except Exception as e:
             logger.warning(f"Failed to load model: {e}")
+        STARTUP_TIMINGS["model load"] = time.perf_counter() - start
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                requests = _lazy_import("requests")
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=16, pool_maxsize=16
+                )
+                self._session = requests.Session()
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def embed(self, texts: List[str]):
+        """Embeds texts with the model, skipping texts already in the cache."""
+        # Pipeline stages may embed from different threads
+        with self._embed_lock, METRICS.timer("embed"):
+            METRICS.add("embed_texts", len(texts))
+            if self.embedding_cache is None:
+                return self._encode(texts)
+            return self.embedding_cache.encode(texts, self._encode)
+
+    def _encode(self, texts: List[str]):
+        with METRICS.timer("model_encode"):
+            METRICS.add("model_encode_texts", len(texts))
+            return self.model.encode(texts, batch_size=64)
+
+    def save_caches(self, synced: bool = True):
+        """
+        Persists the caches after a run. Reddit posts count as seen only
+        once their batch is stored; after a failed sync they are forgotten
+        so the next run fetches them again.
+        """
+        logger.info(f"HTTP cache: {self.http_cache.stats()}")
+        self.circuits.save()
+        if synced:
+            self.seen_posts.save()
+        else:
+            self.seen_posts.discard_pending()
+        if self.embedding_cache is not None:
+            self.embedding_cache.save()
+            logger.info(f"Embedding cache: {self.embedding_cache.stats()}")
+
+    @staticmethod
+    def clean_title(title: str) -> str:
+        """Strips HTML entities and trailing " - Site Name" suffixes from a title."""
+        clean_title = (title or "").replace("&amp;", "&").replace("&quot;", '"')
+        return re.split(r" [-|:] ", clean_title)[0]  # Strip " - Site Name"
 
     def extract_topic(self, title: str, entry: Any = None) -> str:
         """
@@ -65,59 +280,66 @@ class TrendFetcher:
         1. Semantic Extraction (if model loaded)
         2. Improved Heuristics
         """
-        # Clean title first
-        clean_title = title.replace("&amp;", "&").replace("&quot;", '"')
-        clean_title = re.split(r" [-|:] ", clean_title)[0]  # Strip " - Site Name"
-
-        # 1. Semantic Extraction
-        if self.model:
-            try:
-                return self.extract_topic_semantic(clean_title)
-            except Exception as e:
-                logger.error(f"Semantic extraction failed: {e}")
+        return self.extract_topics([title], [entry])[0]
 
-        # 2. Improved Fallback Heuristics
-        return self.extract_topic_heuristic(clean_title, entry)
-
-    def extract_topic_semantic(self, text: str) -> str:
+    def extract_topics(
+        self, titles: List[str], entries: Optional[List[Any]] = None
+    ) -> List[str]:
         """
-        Uses simple embedding similarity to find the most 'representative' 1-3 gram.
-        Simplified KeyBERT-like approach.
+        Batched version of extract_topic.
+        All titles share a single semantic extraction pass so the model is
+        called with a few large batches instead of twice per title.
         """
-        from sklearn.metrics.pairwise import cosine_similarity
-        from sklearn.feature_extraction.text import CountVectorizer
+        if entries is None:
+            entries = [None] * len(titles)
+        clean_titles = [self.clean_title(t) for t in titles]
+        METRICS.add("extract_topics_texts", len(titles))
+
+        with METRICS.timer("extract_topics"):
+            # 1. Semantic Extraction
+            if self.model and clean_titles:
+                try:
+                    return self.extract_topics_semantic(clean_titles)
+                except Exception as e:
+                    logger.error(f"Semantic extraction failed: {e}")
+
+            # 2. Improved Fallback Heuristics
+            return [
+                self.extract_topic_heuristic(t, entry)
+                for t, entry in zip(clean_titles, entries)
+            ]
 
+    def extract_topics_semantic(self, texts: List[str]) -> List[str]:
+        """
+        Batched KeyBERT-like extraction.
+        Candidates (1-3 grams) come from a run-wide vocabulary, so an n-gram
+        shared by many titles or batches is embedded once; each call embeds
+        its texts plus unseen candidates in a single encode call, then picks
+        the candidate closest to each text.
+        """
         # Generate candidates (n-grams)
         # We look for 1, 2, and 3-grams.
-        n_gram_range = (1, 3)
-        stop_words = "english"
-
-        try:
-            count = CountVectorizer(
-                ngram_range=n_gram_range, stop_words=stop_words
-            ).fit([text])
-            candidates = count.get_feature_names_out()
-        except Exception:
-            # If text is too short or empty, CountVectorizer might fail or return empty
-            return text
-
-        if len(candidates) == 0:
-            return text
-
-        # Embed doc and candidates
-        doc_embedding = self.model.encode([text])
-        candidate_embeddings = self.model.encode(candidates)
-
-        # Calculate distances
-        distances = cosine_similarity(doc_embedding, candidate_embeddings)
-        keywords = [
-            candidates[index] for index in distances.argsort()[0][-1:]
-        ]  # Get top 1
-
-        topic = keywords[0]
-
-        # Capitalize for display (Title Case)
-        return topic.title()
+        if self._candidate_analyzer is None:
+            text_features = _lazy_import("sklearn.feature_extraction.text")
+            self._candidate_analyzer = text_features.CountVectorizer(
+                ngram_range=(1, 3), stop_words="english"
+            ).build_analyzer()
+
+        keyphrases_module = _lazy_import("keyphrases")
+        if self.candidate_vocabulary is None:
+            self.candidate_vocabulary = keyphrases_module.CandidateVocabulary()
+
+        known = len(self.candidate_vocabulary)
+        topics = keyphrases_module.extract_topics(
+            texts, self._candidate_analyzer, self.embed, self.candidate_vocabulary
+        )
+        logger.info(
+            f"Semantic extraction: {len(texts)} titles, "
+            f"{len(self.candidate_vocabulary) - known} new candidates "
+            f"({len(self.candidate_vocabulary)} this run)."
+        )
+        # Capitalize for display (Title Case); texts without candidates stay as-is
+        return [topic.title() if topic else text for text, topic in zip(texts, topics)]
 
     def extract_topic_heuristic(self, title: str, entry: Any = None) -> str:
         # 1. Try RSS Tags
@@ -164,9 +386,109 @@ class TrendFetcher:
 
         return " ".join(words[:4]) + "..."
 
-    def fetch_google_trends(self, geo="US"):
-        """Fetches daily trending searches from Google Trends RSS."""
-        logger.info("Fetching Google Trends (RSS)...")
+    def _get(self, url: str, **kwargs):
+        """
+        GET through the shared session, respecting the per-host limit.
+        Every attempt times out after request_timeout seconds (or the given
+        timeout) or when the current source's budget runs out, whichever is
+        first. Connection errors, timeouts and retryable statuses are retried
+        with jittered exponential backoff while the budget allows; the last
+        error is then raised (or the last response returned) and the source
+        is marked failed.
+        """
+        host = urlparse(url).netloc
+        budget = getattr(self._source, "budget", None)
+        max_timeout = kwargs.pop("timeout", self.config["request_timeout"])
+        exceptions = _lazy_import("requests").exceptions
+        attempt = 0
+        while True:
+            timeout = max_timeout
+            if budget is not None:
+                timeout = min(timeout, budget.remaining())
+                if timeout <= 0:
+                    self._mark_source_failed()
+                    raise exceptions.Timeout(f"Source budget exhausted before {url}")
+            try:
+                with self.host_limiter.slot(url), METRICS.timer(
+                    "http_request", host=host
+                ):
+                    resp = self.session.get(url, timeout=timeout, **kwargs)
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                METRICS.add("http_errors", host=host, error=type(e).__name__)
+                resp, error = None, e
+            else:
+                METRICS.add("http_responses", host=host, status=resp.status_code)
+                METRICS.add("http_response_bytes", len(resp.content or b""), host=host)
+                if resp.status_code not in RETRYABLE_STATUS:
+                    if resp.status_code >= 400:
+                        self._mark_source_failed()
+                    return resp
+
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(30, 2**attempt))
+            attempt += 1
+            if attempt > HTTP_MAX_RETRIES or (
+                budget is not None and budget.remaining() <= delay
+            ):
+                self._mark_source_failed()
+                if resp is None:
+                    raise error
+                return resp
+            METRICS.add("http_retries", host=host)
+            # A Response is falsy for status >= 400, so test for None
+            reason = error if resp is None else resp.status_code
+            logger.warning(
+                f"GET {url} failed ({reason}), "
+                f"retrying in {delay:.1f}s ({attempt}/{HTTP_MAX_RETRIES})..."
+            )
+            time.sleep(delay)
+
+    def _get_parsed(
+        self, url: str, parse: Callable[[bytes], Any], **kwargs
+    ) -> Tuple[int, Any]:
+        """
+        Conditional GET: sends the cached validators and, on 304 Not Modified,
+        returns the previously parsed payload without parsing again.
+        Returns (status_code, parsed); parsed is None unless 200 or 304.
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        resp = self._get(
+            url, headers={**headers, **self.http_cache.validators(url)}, **kwargs
+        )
+
+        if resp.status_code == 304:
+            cached = self.http_cache.load(url, parse)
+            if cached is not None:
+                self.http_cache.record(not_modified=True)
+                return resp.status_code, cached
+            # Cache vanished underneath us: fetch unconditionally
+            resp = self._get(url, headers=headers, **kwargs)
+
+        if resp.status_code != 200:
+            return resp.status_code, None
+        with METRICS.timer("parse", host=urlparse(url).netloc):
+            parsed = parse(resp.content)
+        self.http_cache.store(url, resp.headers, resp.content, parsed)
+        self.http_cache.record(not_modified=False)
+        return resp.status_code, parsed
+
+    @staticmethod
+    def _parse_feed_entries(content, limit: Optional[int] = None):
+        """
+        Entries of an RSS/Atom payload, at most limit of them.
+        Plain RSS 2.0 bytes take the streaming fast path; Atom, RDF,
+        malformed markup (e.g. HTML entities) and URLs fall back to feedparser.
+        """
+        if isinstance(content, bytes):
+            try:
+                return parse_rss(content, limit)
+            except UnsupportedFeed as e:
+                logger.debug(f"Feed fast path unavailable ({e}), using feedparser")
+        METRICS.add("feedparser_fallbacks")
+        return _lazy_import("feedparser").parse(content).entries[:limit]
+
+    def iter_google_trends(self, geo="US", limit: int = 20) -> Iterator[SourceItem]:
+        logger.info(f"Fetching Google Trends (RSS, {geo})...")
         # Try the atom feed if rss fails, or just ensure headers are good.
         rss_url = f"https://trends.google.com/trending/rss?geo={geo}"
         try:
@@ -176,16 +498,18 @@ class TrendFetcher:
                 "Accept": "application/xml,application/xhtml+xml,text/xml;q=0.9,text/plain;q=0.8",
                 "Referer": "https://trends.google.com/",
             }
-            response = requests.get(rss_url, headers=headers)
-            if response.status_code != 200:
+            status, entries = self._get_parsed(
+                rss_url,
+                lambda content: self._parse_feed_entries(content, limit),
+                headers=headers,
+            )
+            if entries is None:
                 logger.error(
-                    f"Google Trends RSS failed with status {response.status_code} for {rss_url}"
+                    f"Google Trends RSS failed with status {status} for {rss_url}"
                 )
                 return  # Skip if failed
 
-            feed = feedparser.parse(response.content)
-
-            for entry in feed.entries[:20]:
+            for entry in entries[:limit]:
                 # Extract Traffic (e.g., "50,000+")
                 traffic_str = (
                     entry.get("ht_approx_traffic", "0")
@@ -199,201 +523,489 @@ class TrendFetcher:
 
                 metric_label = f"{entry.get('ht_approx_traffic', 'N/A')} Searches"
 
-                self.trends.append(
-                    {
-                        "date": datetime.date.today().isoformat(),
-                        "source": "Google Trends",
-                        "trend": entry.title,
-                        "url": f"https://trends.google.com/trends/explore?q={entry.title}",
-                        "raw_text": entry.title,
-                        "trend_score": score,
-                        "metric_label": metric_label,
-                    }
+                yield SourceItem(
+                    TrendRecord(
+                        date=datetime.date.today().isoformat(),
+                        source=_geo_label("Google Trends", geo),
+                        trend=entry.title,
+                        url=f"https://trends.google.com/trends/explore?q={entry.title}",
+                        raw_text=entry.title,
+                        trend_score=score,
+                        metric_label=metric_label,
+                    )
                 )
         except Exception as e:
-            logger.error(f"Error fetching Google Trends RSS: {e}")
+            self._mark_source_failed()
+            logger.error(f"Error fetching Google Trends RSS ({geo}): {e}")
 
-    def fetch_pytrends(self):
-        """Fetches realtime trends using pytrends (Secondary Source)."""
-        logger.info("Fetching Google Trends (pytrends)...")
+    def iter_pytrends(self, geo="US", limit: int = 20) -> Iterator[SourceItem]:
+        logger.info(f"Fetching Google Trends (pytrends, {geo})...")
         try:
-            pytrends = TrendReq(hl="en-US", tz=360)
+            TrendReq = _lazy_import("pytrends.request").TrendReq
+            # pytrends makes its own requests: bound them by the budget too
+            timeout = self.config["request_timeout"]
+            budget = getattr(self._source, "budget", None)
+            if budget is not None:
+                timeout = max(0.1, min(timeout, budget.remaining()))
+            pytrends = TrendReq(hl="en-US", tz=360, timeout=(timeout, timeout))
             # Try realtime first
-            realtime_trends = pytrends.realtime_trending_searches(pn="US")
+            realtime_trends = pytrends.realtime_trending_searches(pn=geo)
 
             # Format: DataFrame with 'title', 'entity_names'
             if not realtime_trends.empty:
-                for _, row in realtime_trends.head(20).iterrows():
+                for _, row in realtime_trends.head(limit).iterrows():
                     title = row["title"]
                     # Pytrends realtime doesn't always give traffic numbers easily in this call
                     # We assign a high default score for Being Realtime
 
-                    self.trends.append(
-                        {
-                            "date": datetime.date.today().isoformat(),
-                            "source": "Google Trends (Live)",
-                            "trend": title,
-                            "url": f"https://trends.google.com/trends/explore?q={title}",
-                            "raw_text": title,
-                            "trend_score": 1000,  # Arbitrary 'Hot' score since no exact number
-                            "metric_label": "Live Trend",
-                        }
+                    yield SourceItem(
+                        TrendRecord(
+                            date=datetime.date.today().isoformat(),
+                            source=_geo_label("Google Trends (Live)", geo),
+                            trend=title,
+                            url=f"https://trends.google.com/trends/explore?q={title}",
+                            raw_text=title,
+                            trend_score=1000,  # Arbitrary 'Hot' score since no exact number
+                            metric_label="Live Trend",
+                        )
                     )
         except Exception as e:
+            self._mark_source_failed()
             logger.warning(f"pytrends fetch failed (expected if API changes): {e}")
 
-    def fetch_rss_feeds(self):
-        """Fetches from Gen Z / Culture RSS feeds."""
-        logger.info("Fetching RSS Feeds...")
-        feeds = [
-            "https://marketingdive.com/feeds/news/",
-            "https://feeds.feedburner.com/TechCrunch/",
-            "https://www.cnbc.com/id/100003114/device/rss/rss.html",
-        ]
+    def iter_rss_feed(self, url: str, limit: int = 10) -> Iterator[SourceItem]:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        for url in feeds:
-            try:
-                # Use requests to get content first to handle headers/user-agent
-                resp = requests.get(url, headers=headers, timeout=10)
-                if resp.status_code == 200:
-                    feed = feedparser.parse(resp.content)
-                else:
-                    logger.warning(
-                        f"RSS {url} failed with {resp.status_code}, trying direct parse fallback"
-                    )
-                    feed = feedparser.parse(url)  # Fallback
-
-                for entry in feed.entries[:10]:
-                    # Pass the full entry to use tags
-                    topic = self.extract_topic(entry.title, entry)
-                    self.trends.append(
-                        {
-                            "date": datetime.date.today().isoformat(),
-                            "source": "RSS",
-                            "trend": topic,
-                            "url": entry.link,
-                            "raw_text": entry.title,
-                            "trend_score": 100,  # Default logic for RSS
-                            "metric_label": "News Feature",
-                        }
-                    )
-            except Exception as e:
-                logger.error(f"Error fetching RSS {url}: {e}")
+        try:
+            # Use requests to get content first to handle headers/user-agent
+            status, entries = self._get_parsed(
+                url,
+                lambda content: self._parse_feed_entries(content, limit),
+                headers=headers,
+                timeout=10,
+            )
+            if entries is None:
+                logger.warning(
+                    f"RSS {url} failed with {status}, trying without browser headers"
+                )
+                # Fallback; goes through _get so it has a timeout, unlike
+                # letting feedparser fetch the URL itself
+                resp = self._get(url, timeout=10)
+                entries = (
+                    self._parse_feed_entries(resp.content, limit)
+                    if resp.status_code == 200
+                    else []
+                )
 
-    def fetch_reddit_gen_z(self):
-        """Fetches hot posts from r/GenZ using JSON endpoint."""
-        logger.info("Fetching Reddit r/GenZ...")
+            for entry in entries[:limit]:
+                # Pass the full entry to use tags
+                yield SourceItem(
+                    TrendRecord(
+                        date=datetime.date.today().isoformat(),
+                        source="RSS",
+                        trend=entry.title,
+                        url=entry.link,
+                        raw_text=entry.title,
+                        trend_score=100,  # Default logic for RSS
+                        metric_label="News Feature",
+                    ),
+                    needs_topic=True,
+                    entry=entry,
+                )
+        except Exception as e:
+            self._mark_source_failed()
+            logger.error(f"Error fetching RSS {url}: {e}")
+
+    def iter_reddit(
+        self,
+        subreddit: str,
+        limit: int = 25,
+        pages: int = DEFAULT_REDDIT_PAGES,
+        generic_flairs: Iterable[str] = DEFAULT_GENERIC_FLAIRS,
+    ) -> Iterator[SourceItem]:
+        """
+        New hot posts of a subreddit, following the listing's after cursor
+        for up to pages pages of limit posts.
+        Posts ingested by earlier runs (see SeenPosts) are skipped, and a
+        page with nothing new ends the walk. A specific flair (not in
+        generic_flairs) is the post's topic, with source "Reddit flair";
+        other posts are queued for topic extraction from their title.
+        """
+        logger.info(f"Fetching Reddit r/{subreddit}...")
+        generic_flairs = {flair.lower() for flair in generic_flairs}
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
-            resp = requests.get(
-                "https://www.reddit.com/r/GenZ/hot.json?limit=25", headers=headers
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                children = data.get("data", {}).get("children", [])
-                for child in children:
+            url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
+            after = None
+            for _ in range(pages):
+                if after is None:
+                    # First page: conditional GET, unchanged listings skip parsing
+                    status, data = self._get_parsed(url, json.loads, headers=headers)
+                else:
+                    # Cursor pages are one-off URLs, not worth caching
+                    resp = self._get(f"{url}&after={after}", headers=headers)
+                    status = resp.status_code
+                    data = json.loads(resp.content) if status == 200 else None
+                if data is None:
+                    logger.error(f"Reddit API returned {status} for r/{subreddit}")
+                    return
+
+                listing = data.get("data", {})
+                new = 0
+                for child in listing.get("children", []):
                     post = child.get("data", {})
-                    if not post.get("stickied"):
-                        # Reddit doesn't have "tags" in the same way, usually just flair
-                        flair = post.get("link_flair_text")
-                        if flair:
-                            # Maybe combine flair + shortened title? Or just shortened title.
-                            # Let's stick to extract_topic with just title for now, or pass flair if we want.
-                            pass
-
-                        topic = self.extract_topic(post.get("title"))
-                        score = post.get("score", 0)
-                        comments = post.get("num_comments", 0)
-
-                        self.trends.append(
-                            {
-                                "date": datetime.date.today().isoformat(),
-                                "source": "Reddit (r/GenZ)",
-                                "trend": topic,
-                                "url": f"https://reddit.com{post.get('permalink')}",
-                                "raw_text": post.get("title"),
-                                "trend_score": score,
-                                "metric_label": f"{score} Upvotes",
-                            }
-                        )
-            else:
-                logger.error(f"Reddit API returned {resp.status_code}")
+                    if post.get("stickied"):
+                        continue
+                    if not self.seen_posts.add(subreddit, post.get("name")):
+                        METRICS.add("reddit_posts_seen", subreddit=subreddit)
+                        continue
+                    new += 1
+                    METRICS.add("reddit_posts_new", subreddit=subreddit)
+
+                    score = post.get("score", 0)
+                    title = post.get("title")
+                    # Reddit has no tags, but a specific flair names the topic
+                    flair = (post.get("link_flair_text") or "").strip()
+                    use_flair = bool(flair) and flair.lower() not in generic_flairs
+                    kind = "Reddit flair" if use_flair else "Reddit"
+
+                    yield SourceItem(
+                        TrendRecord(
+                            date=datetime.date.today().isoformat(),
+                            source=f"{kind} (r/{subreddit})",
+                            trend=flair if use_flair else title,
+                            url=f"https://reddit.com{post.get('permalink')}",
+                            raw_text=title,
+                            trend_score=score,
+                            metric_label=f"{score} Upvotes",
+                        ),
+                        needs_topic=not use_flair,
+                    )
+
+                after = listing.get("after")
+                if not after or not new:
+                    break  # End of listing, or the rest was ingested before
         except Exception as e:
-            logger.error(f"Error fetching Reddit: {e}")
+            self._mark_source_failed()
+            logger.error(f"Error fetching Reddit r/{subreddit}: {e}")
 
-    def get_all_trends(self) -> List[Dict[str, Any]]:
-        self.fetch_google_trends()
-        self.fetch_pytrends()
-        self.fetch_rss_feeds()
-        self.fetch_reddit_gen_z()
-        return self.trends
+    def start_run(self, deadline: Optional[float] = None):
+        """
+        Starts the run deadline (run_deadline from sources.json by default)
+        that caps every source budget from now on.
+        """
+        seconds = self.config["run_deadline"] if deadline is None else deadline
+        self.deadline = Budget(seconds)
 
+    def _mark_source_failed(self):
+        self._source.failed = True
 
-class TrendClassifier:
-    def __init__(self):
-        self.gen_z_keywords = [
-            "tiktok",
-            "skibidi",
-            "rizz",
-            "gyatt",
-            "fanum",
-            "kai cenat",
-            "mrbeast",
-            "roblox",
-            "fortnite",
-            "gen z",
-            "zoomer",
-        ]
-        self.millennial_keywords = [
-            "interest rates",
-            "housing market",
-            "inflation",
-            "millennial",
-            "90s",
-            "nostalgia",
-            "work from home",
-            "coffee",
-            "wine",
+    def iter_source(
+        self, name: str, budget: float, factory: Callable[[], Iterator[SourceItem]]
+    ) -> Iterator[SourceItem]:
+        """
+        Runs one source within budget seconds, capped by the run deadline.
+        Requests made meanwhile on this thread share the budget (see _get);
+        once it runs out the source stops and keeps what it yielded. Sources
+        whose circuit is open, or that start after the deadline, are skipped.
+        A run that yielded nothing after a request failed or the source
+        raised counts as a failure for the circuit breaker.
+        """
+        if self.deadline is not None and self.deadline.expired():
+            METRICS.add("sources_skipped", source=name, reason="deadline")
+            logger.warning(f"Run deadline passed, skipping {name}.")
+            return
+        if not self.circuits.allow(name):
+            METRICS.add("sources_skipped", source=name, reason="circuit_open")
+            logger.warning(f"Circuit open, skipping {name}.")
+            return
+
+        self._source.budget = Budget(budget, parent=self.deadline)
+        self._source.failed = False
+        items = 0
+        try:
+            for item in factory():
+                items += 1
+                yield item
+                if self._source.budget.expired():
+                    METRICS.add("source_timeouts", source=name)
+                    logger.warning(f"{name} ran out of time after {items} items.")
+                    break
+        except Exception:
+            self._source.failed = True
+            raise
+        finally:
+            self.circuits.record(name, ok=items > 0 or not self._source.failed)
+            self._source.budget = None
+
+    def sources(self) -> List[Tuple[str, Callable[[], Iterator[SourceItem]]]]:
+        """
+        Every configured source as (name, generator factory): one entry per
+        Google Trends geo, pytrends geo, RSS feed and subreddit.
+        """
+        return [(name, factory) for name, factory, _ in self.scheduled_sources()]
+
+    def scheduled_sources(
+        self,
+    ) -> List[Tuple[str, Callable[[], Iterator[SourceItem]], float]]:
+        """
+        Like sources(), with each source's daemon poll interval in seconds.
+        Factories run their source through iter_source, so time budgets and
+        the circuit breaker apply wherever sources are consumed.
+        """
+        config = self.config
+        sources = (
+            [
+                (
+                    f"Google Trends {s['geo']}",
+                    partial(self.iter_google_trends, s["geo"], s["limit"]),
+                    s,
+                )
+                for s in config["google_trends"]
+            ]
+            + [
+                (
+                    f"Google Trends (Live) {s['geo']}",
+                    partial(self.iter_pytrends, s["geo"], s["limit"]),
+                    s,
+                )
+                for s in config["pytrends"]
+            ]
+            + [
+                (
+                    f"Reddit r/{s['subreddit']}",
+                    partial(
+                        self.iter_reddit,
+                        s["subreddit"],
+                        s["limit"],
+                        s["pages"],
+                        s["generic_flairs"],
+                    ),
+                    s,
+                )
+                for s in config["reddit"]
+            ]
+            + [
+                (
+                    f"RSS {s['url']}",
+                    partial(self.iter_rss_feed, s["url"], s["limit"]),
+                    s,
+                )
+                for s in config["rss"]
+            ]
+        )
+        return [
+            (name, partial(self.iter_source, name, s["budget"], factory), s["interval"])
+            for name, factory, s in sources
         ]
-        self.gen_alpha_keywords = [
-            "skibidi",
-            "ipad kid",
-            "cocomelon",
-            "bluey",
-            "alpha",
-            "sigma",
+
+    def get_all_trends(
+        self, classifier: "TrendClassifier" = None, deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs every source through run_pipeline within a fresh run deadline
+        and returns the extracted, classified records.
+        """
+        trends = []
+        self.start_run(deadline)
+        run_pipeline(
+            self,
+            classifier or TrendClassifier(),
+            trends.extend,
+            max_workers=self.config["max_concurrency"],
+        )
+        return trends
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Builds one regex alternation from a character trie of words, so shared
+    prefixes are matched once and scanning stays fast with thousands of words.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of word
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
         ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            # A shorter word ends here; the longer continuation is optional
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie) or "(?!)"  # No words: never match
+
+
+class TrendClassifier:
+    def __init__(
+        self,
+        keywords_path: str = KEYWORDS_PATH,
+        encoder: Optional[Callable[[List[str]], Any]] = None,
+        threshold: float = EMBEDDING_THRESHOLD,
+    ):
+        # Generation -> keywords, in priority order (first match wins)
+        with open(keywords_path) as f:
+            config = json.load(f)
+        self.keywords: Dict[str, List[str]] = {
+            generation: [k.lower() for k in settings.get("keywords", [])]
+            for generation, settings in config.items()
+        }
+
+        # Optional embedding mode: texts are compared against one centroid
+        # per generation built from its seed phrases.
+        self.seeds: Dict[str, List[str]] = {
+            generation: settings["seeds"]
+            for generation, settings in config.items()
+            if settings.get("seeds")
+        }
+        self.encoder = encoder
+        self.threshold = threshold
+        self._centroids = None
+
+        # Keyword -> generations listing it (e.g. "skibidi" is Gen Z and Gen Alpha)
+        self._keyword_generations: Dict[str, List[str]] = {}
+        for generation, keywords in self.keywords.items():
+            for keyword in keywords:
+                self._keyword_generations.setdefault(keyword, []).append(generation)
+
+        # One matcher for every keyword; lookarounds act as word boundaries
+        # so "alpha" no longer matches "alphabet". An optional plural "s"
+        # still matches "ipad kids"; group 1 is the keyword itself.
+        self._matcher = re.compile(
+            rf"(?<!\w)({_trie_pattern(list(self._keyword_generations))})s?(?!\w)",
+            re.IGNORECASE,
+        )
 
     def classify(self, text: str) -> str:
-        text_lower = text.lower()
-        if any(k in text_lower for k in self.gen_alpha_keywords):
-            return "Gen Alpha"
-        if any(k in text_lower for k in self.gen_z_keywords):
-            return "Gen Z"
-        if any(k in text_lower for k in self.millennial_keywords):
-            return "Millennials"
-        return "General"  # Default
-
-
-class SheetWriter:
-    def __init__(self):
+        return self.classify_many([text])[0]["generation"]
+
+    def classify_many(
+        self, texts: List[str], embeddings: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Classifies a batch of texts.
+        Each result holds the chosen generation, the matched keywords and
+        the number of keyword hits per generation.
+        With an encoder (or precomputed embeddings) the generation comes from
+        the nearest seed centroid when its cosine similarity reaches the
+        threshold, falling back to keywords otherwise.
+        """
+        METRICS.add("classify_texts", len(texts))
+        with METRICS.timer("classify"):
+            return self._classify_many(texts, embeddings)
+
+    def _classify_many(self, texts: List[str], embeddings: Any = None):
+        results = self._classify_keywords(texts)
+        if not texts or (self.encoder is None and embeddings is None):
+            return results
+
+        try:
+            similarities = self._centroid_similarities(texts, embeddings)
+        except Exception as e:
+            logger.error(f"Embedding classification failed: {e}")
+            return results
+
+        generations = list(self.seeds)
+        best = similarities.argmax(axis=1)
+        confidence = similarities.max(axis=1)
+        for result, index, score in zip(results, best, confidence):
+            result["confidence"] = float(score)
+            if score >= self.threshold:
+                result["generation"] = generations[index]
+                result["method"] = "embedding"
+        return results
+
+    def _centroid_similarities(self, texts: List[str], embeddings: Any = None):
+        """Cosine similarity of every text to every generation centroid."""
+        import numpy as np
+
+        def normalize(matrix):
+            matrix = np.asarray(matrix, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+            return matrix / np.maximum(norms, 1e-12)
+
+        if self._centroids is None:
+            # Embed every seed phrase in one call, then average per generation
+            phrases = [p for seeds in self.seeds.values() for p in seeds]
+            seed_embeddings = normalize(self.encoder(phrases))
+            centroids, start = [], 0
+            for seeds in self.seeds.values():
+                centroids.append(seed_embeddings[start : start + len(seeds)].mean(0))
+                start += len(seeds)
+            self._centroids = normalize(np.vstack(centroids))
+
+        if embeddings is None:
+            embeddings = self.encoder([text or "" for text in texts])
+        return normalize(embeddings) @ self._centroids.T
+
+    def _classify_keywords(self, texts: List[str]) -> List[Dict[str, Any]]:
+        results = []
+        for text in texts:
+            matches = [m.group(1).lower() for m in self._matcher.finditer(text or "")]
+            hits = {generation: 0 for generation in self.keywords}
+            for keyword in matches:
+                for generation in self._keyword_generations[keyword]:
+                    hits[generation] += 1
+
+            generation = next(
+                (g for g in self.keywords if hits[g]), "General"  # Default
+            )
+            results.append(
+                {
+                    "generation": generation,
+                    "matches": matches,
+                    "hits": hits,
+                    "method": "keyword",
+                }
+            )
+        return results
+
+
+def _score_cell(score: Any) -> Any:
+    """A Score cell as a number where it holds one; RAW writes keep text."""
+    return int(score) if str(score).isdigit() else score
+
+
+def _score_rank(score: Any) -> int:
+    return score if isinstance(score, int) else 0
+
+
+class SheetWriter(StorageBackend):
+    name = "sheets"
+
+    def __init__(self, retention_days: int = RETENTION_DAYS):
         self.client = None
         self.sheet = None
+        # Generation tabs keep this many days; older rows move to
+        # per-month archive tabs such as "Gen Z 2026-09"
+        self.retention_days = retention_days
+        # Backfill: row index per tab receiving moved rows
+        self._backfill_indexes: Dict[str, Dict[str, Any]] = {}
 
     def connect(self):
         try:
             creds = None
             if CREDS_JSON:
+                ServiceAccountCredentials = _lazy_import(
+                    "oauth2client.service_account"
+                ).ServiceAccountCredentials
                 creds_dict = json.loads(CREDS_JSON)
                 creds = ServiceAccountCredentials.from_json_keyfile_dict(
                     creds_dict, SCOPE
                 )
             if creds:
-                self.client = gspread.authorize(creds)
+                self.client = _lazy_import("gspread").authorize(creds)
                 if SHEET_ID:
                     self.sheet = self.client.open_by_key(SHEET_ID)
                 else:
@@ -403,156 +1015,741 @@ class SheetWriter:
         except Exception as e:
             logger.error(f"Error connecting to Sheets: {repr(e)}")
 
-    def sync_trends(self, trends: List[Dict[str, Any]]):
+    def sync_trends(self, trends: List[Dict[str, Any]], mode: str = None) -> bool:
         """
         Syncs new trends with existing sheet data.
         Deduplicates by Date + Trend (case-insensitive).
         Merges 'Source' fields for duplicates.
+
+        All tabs are read with one values batchGet, merged locally and
+        committed with one values batchUpdate.
+        mode="delta" (default) appends new rows and patches changed
+        Source/URL cells in place; mode="rewrite" re-sorts each tab in full.
+        Rows older than the retention window are moved into per-month
+        archive tabs in the same commit; a tab losing rows is rewritten.
+        Returns True once the commit succeeded; False when it failed or no
+        sheet is connected (the trends are only printed then).
         """
         if not self.sheet:
-            print(json.dumps(trends[:3], indent=2))
-            return
+            print(json.dumps([dict(t) for t in trends[:3]], indent=2))
+            return False
 
-        tabs = ["Gen Z", "Millennials", "Gen Alpha", "General"]
+        mode = mode or SYNC_MODE
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        a1_to_rowcol = _lazy_import("gspread.utils").a1_to_rowcol
 
-        for tab_name in tabs:
-            try:
-                worksheet = self.sheet.worksheet(tab_name)
-            except gspread.WorksheetNotFound:
-                worksheet = self.sheet.add_worksheet(title=tab_name, rows=1000, cols=7)
-                worksheet.append_row(
-                    ["Date", "Trend", "Source", "URL", "Raw Text", "Score", "Metric"]
-                )
+        # 1. Read ALL tabs in one round-trip
+        try:
+            worksheets = self._ensure_tabs(GENERATION_TABS)
+            response = self._with_backoff(
+                self.sheet.values_batch_get,
+                [absolute_range_name(tab, "A1:G") for tab in GENERATION_TABS],
+            )
+        except Exception as e:
+            logger.error(f"Failed to read worksheets: {e}")
+            return False
 
-            # 1. Read ALL existing data
-            try:
-                existing_rows = worksheet.get_all_values()
-            except Exception as e:
-                logger.error(f"Failed to read worksheet {tab_name}: {e}")
-                continue
+        data = []
+        row_counts = {}
+        summaries = []
+
+        def add(tab_name: str, updates: List[Tuple[str, List]], summary: str):
+            for start_cell, values in updates:
+                data.append(
+                    {
+                        "range": absolute_range_name(tab_name, start_cell),
+                        "values": values,
+                    }
+                )
+                METRICS.add("sheets_rows_written", len(values), tab=tab_name)
+                last_row = a1_to_rowcol(start_cell)[0] + len(values) - 1
+                row_counts[tab_name] = max(row_counts.get(tab_name, 0), last_row)
+            summaries.append(f"Synced {tab_name}: {summary}")
+
+        # 2. Merge every tab locally
+        cutoff = retention_cutoff(self.retention_days)
+        archive: Dict[str, List[Dict[str, Any]]] = {}  # archive tab -> trends
+        for tab_name, value_range in zip(
+            GENERATION_TABS, response.get("valueRanges", [])
+        ):
+            existing_rows = value_range.get("values", [])
+            METRICS.add(
+                "sheets_rows_read", max(len(existing_rows) - 1, 0), tab=tab_name
+            )
+            tab_new_trends = [t for t in trends if t.get("generation") == tab_name]
 
-            if not existing_rows:
-                # Should at least have headers if newly created, but just in case
-                header = [
-                    "Date",
-                    "Trend",
-                    "Source",
-                    "URL",
-                    "Raw Text",
-                    "Score",
-                    "Metric",
+            hot_rows = existing_rows
+            if cutoff:
+                hot_rows, expired = self._split_expired(existing_rows, cutoff)
+                expired += [t for t in tab_new_trends if is_expired(t["date"], cutoff)]
+                tab_new_trends = [
+                    t for t in tab_new_trends if not is_expired(t["date"], cutoff)
                 ]
+                for t in expired:
+                    archive_tab = f"{tab_name} {archive_month(t['date'])}"
+                    archive.setdefault(archive_tab, []).append(t)
+
+            if mode == "rewrite" or len(hot_rows) < len(existing_rows):
+                updates, summary = self._plan_rewrite(hot_rows, tab_new_trends)
+                # Blank out the rows that moved to the archive
+                updates[0][1].extend(
+                    [[""] * len(HEADER)] * (len(existing_rows) - len(updates[0][1]))
+                )
             else:
-                header = existing_rows[0]
-                if len(header) < 7:
-                    # Add missing headers if updating old sheet
-                    header.extend(["Score", "Metric"])
-                existing_rows = existing_rows[1:]  # Skip header
-
-            # 2. Combine and Deduplicate
-            # Key: (date, normalized_trend) -> {data_dict}
-            merged_data = {}
-
-            # Helper to normalize trend
-            def normalize(t):
-                return t.lower().strip()
-
-            # Helper to merge entries
-            def merge_entry(existing, new_entry):
-                # Merge Source
-                sources = set(
-                    [s.strip() for s in existing["Source"].split(",") if s.strip()]
+                updates, summary = self._plan_delta(existing_rows, tab_new_trends)
+            add(tab_name, updates, summary)
+
+        # 3. Plan archive appends; archive tabs are only read when they
+        # receive rows
+        if archive:
+            try:
+                worksheets = self._ensure_tabs(
+                    list(archive),
+                    row_count=max(len(t) for t in archive.values()) + 1,
                 )
-                sources.add(new_entry["source"])
-                existing["Source"] = ", ".join(sorted(list(sources)))
-
-                # Keep first URL (or prefer new one if existing is empty? rarely empty)
-                if not existing["URL"] and new_entry["url"]:
-                    existing["URL"] = new_entry["url"]
-
-                return existing
-
-            # Process Existing
-            for row in existing_rows:
-                if len(row) < 5:
-                    continue  # Skip malformed
-                date, trend, source, url, raw_text = (
-                    row[0],
-                    row[1],
-                    row[2],
-                    row[3],
-                    row[4],
+                response = self._with_backoff(
+                    self.sheet.values_batch_get,
+                    [absolute_range_name(tab, "A1:G") for tab in archive],
                 )
-                score = int(row[5]) if len(row) > 5 and row[5].isdigit() else 0
-                metric = row[6] if len(row) > 6 else ""
-
-                key = (date, normalize(trend))
-                merged_data[key] = {
-                    "Date": date,
-                    "Trend": trend,  # Keep original casing of first occurrence
-                    "Source": source,
-                    "URL": url,
-                    "Raw Text": raw_text,
-                    "Score": score,
-                    "Metric": metric,
-                }
+            except Exception as e:
+                logger.error(f"Failed to read archive worksheets: {e}")
+                return False
+            for (tab_name, expired), value_range in zip(
+                archive.items(), response.get("valueRanges", [])
+            ):
+                existing_rows = value_range.get("values", [])
+                METRICS.add(
+                    "sheets_rows_read", max(len(existing_rows) - 1, 0), tab=tab_name
+                )
+                add(tab_name, *self._plan_delta(existing_rows, expired))
 
-            # Process New
-            tab_new_trends = [t for t in trends if t.get("generation") == tab_name]
-            for t in tab_new_trends:
-                date = t["date"]
-                trend = t["trend"]
-                key = (date, normalize(trend))
-
-                if key in merged_data:
-                    # Merge
-                    merged_data[key] = merge_entry(merged_data[key], t)
-                else:
-                    # Add New
-                    merged_data[key] = {
-                        "Date": date,
-                        "Trend": trend,
-                        "Source": t["source"],
-                        "URL": t["url"],
-                        "Raw Text": t["raw_text"],
-                        "Score": t.get("trend_score", 0),
-                        "Metric": t.get("metric_label", ""),
-                    }
+        # 4. Commit every tab in one round-trip
+        try:
+            self._ensure_row_capacity(worksheets, row_counts)
+            if data:
+                self._with_backoff(
+                    self.sheet.values_batch_update,
+                    {"valueInputOption": "RAW", "data": data},
+                )
+        except Exception as e:
+            logger.error(f"Failed to write worksheets: {e}")
+            return False
+        for summary in summaries:
+            logger.info(summary)
+        return True
+
+    def sync_rising(self, rising: List[Dict[str, Any]]):
+        """Overwrites the Rising tab with the current ranking."""
+        if not self.sheet:
+            return
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        header = _lazy_import("history").RISING_HEADER
+        rows = [header] + [
+            [
+                r["date"],
+                r["trend"],
+                r["generation"],
+                r["velocity"],
+                r["acceleration"],
+                r["score"],
+                r["days_seen"],
+            ]
+            for r in rising
+        ]
+        try:
+            worksheets = self._ensure_tabs([RISING_TAB])
+            existing = self._with_backoff(
+                self.sheet.values_get, absolute_range_name(RISING_TAB, "A1:G")
+            ).get("values", [])
+            # Blank out rows of a longer previous ranking
+            rows += [[""] * len(header)] * (len(existing) - len(rows))
+            self._ensure_row_capacity(worksheets, {RISING_TAB: len(rows)})
+            self._with_backoff(
+                self.sheet.values_batch_update,
+                {
+                    "valueInputOption": "RAW",
+                    "data": [
+                        {"range": absolute_range_name(RISING_TAB, "A1"), "values": rows}
+                    ],
+                },
+            )
+            METRICS.add("sheets_rows_written", len(rows), tab=RISING_TAB)
+            logger.info(f"Synced {RISING_TAB}: {len(rising)} trends.")
+        except Exception as e:
+            logger.error(f"Failed to write {RISING_TAB} tab: {e}")
 
-            # 3. Write Back
-            # Convert back to list of lists
-            # Sort by Date (descending) then Trend Score (descending)
-            final_rows = list(merged_data.values())
-            final_rows.sort(key=lambda x: (x["Date"], x["Score"]), reverse=True)
-
-            rows_to_write = [header] + [
-                [
-                    r["Date"],
-                    r["Trend"],
-                    r["Source"],
-                    r["URL"],
-                    r["Raw Text"],
-                    r["Score"],
-                    r["Metric"],
+    @property
+    def connected(self) -> bool:
+        return self.sheet is not None
+
+    def read_trends(
+        self, generation: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.read_trends_many([generation], limit)[generation]
+
+    def read_trends_many(
+        self, generations: List[str], limit: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Reads every generation tab in one batch request."""
+        if not self.sheet:
+            raise RuntimeError("Not connected to Google Sheets.")
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        response = self._with_backoff(
+            self.sheet.values_batch_get,
+            [absolute_range_name(tab, "A2:G") for tab in generations],
+        )
+        return {
+            tab: self._parse_rows(value_range.get("values", []))[:limit]
+            for tab, value_range in zip(generations, response["valueRanges"])
+        }
+
+    def read_archive(self, generation: str, month: str) -> List[Dict[str, Any]]:
+        if not self.sheet:
+            raise RuntimeError("Not connected to Google Sheets.")
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        APIError = _lazy_import("gspread.exceptions").APIError
+        try:
+            rows = self._with_backoff(
+                self.sheet.values_get,
+                absolute_range_name(f"{generation} {month}", "A2:G"),
+            ).get("values", [])
+        except APIError as e:
+            if e.code != 400:
+                raise
+            return []  # Unknown range: no archive tab for that month
+        return self._parse_rows(rows)
+
+    @property
+    def store_id(self) -> str:
+        return f"sheets:{SHEET_ID}"
+
+    def backfill_tables(self) -> List[str]:
+        """Generation tabs, then their monthly archive tabs by title."""
+        if not self.sheet:
+            raise RuntimeError("Not connected to Google Sheets.")
+        titles = [ws.title for ws in self._with_backoff(self.sheet.worksheets)]
+        archives = sorted(
+            title
+            for title in titles
+            if title not in GENERATION_TABS and self._tab_generation(title)
+        )
+        return [tab for tab in GENERATION_TABS if tab in titles] + archives
+
+    def read_chunk(self, table: str, after: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Up to limit rows of a tab below row after, by row number (the id).
+        Blank rows, such as rows a backfill moved to another tab, are skipped,
+        so windows are read until one has rows or the tab's last row.
+        """
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        generation = self._tab_generation(table)
+        row_count = next(
+            ws.row_count
+            for ws in self._with_backoff(self.sheet.worksheets)
+            if ws.title == table
+        )
+        start = max(after + 1, 2)  # Row 1 is the header
+        while start <= row_count:
+            end = min(start + limit - 1, row_count)
+            rows = self._with_backoff(
+                self.sheet.values_get,
+                absolute_range_name(table, f"A{start}:G{end}"),
+            ).get("values", [])
+            METRICS.add("sheets_rows_read", len(rows), tab=table)
+            chunk = []
+            for row_number, row in enumerate(rows, start=start):
+                if len(row) < 2 or not row[0]:
+                    continue
+                row = row + [""] * (len(HEADER) - len(row))
+                chunk.append(
+                    {
+                        "id": row_number,
+                        "generation": generation,
+                        "date": row[0],
+                        "trend": row[1],
+                        "source": row[2],
+                        "url": row[3],
+                        "raw_text": row[4],
+                        "score": row[5],
+                        "metric": row[6],
+                    }
+                )
+            if chunk:
+                return chunk
+            start = end + 1
+        return []
+
+    def update_extractions(
+        self, table: str, updates: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """
+        Writes back a backfill chunk in one values batchUpdate.
+        A new topic is written to the row's Trend cell. A row classified
+        into another generation moves to that generation's tab (or its
+        archive tab for the same month), where it is appended. A row whose
+        new date and trend match another row's, in its own tab or the one
+        it moves to, is merged into that row as a sync would: sources are
+        merged, the first URL and the higher score are kept. Moved and
+        merged rows are blanked so later row numbers stay valid.
+        Returns (updated, merged) counts.
+        """
+        absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+        generation = self._tab_generation(table)
+        suffix = table[len(generation) :]  # " YYYY-MM" for archive tabs
+        worksheets = self._ensure_tabs(
+            list(
+                dict.fromkeys(
+                    u["generation"] + suffix
+                    for u in updates
+                    if u["generation"] != generation
+                )
+            )
+        )
+        if any(u["generation"] == generation for u in updates):
+            # Read before any row is blanked below, so the index tracks it
+            self._backfill_index(table)
+        data = []
+        row_counts = {}
+        updated = merged = 0
+
+        def write(tab: str, cell: str, values: List[Any]):
+            data.append({"range": absolute_range_name(tab, cell), "values": [values]})
+
+        for u in updates:
+            target = u["generation"] + suffix
+            index = self._backfill_index(target)
+            if target == table:
+                # The row's old trend no longer names it
+                self._forget_backfill_row(index, u["id"])
+            key = (u["date"], normalize_trend(u["trend"]))
+            entry = index["keys"].get(key)
+            if entry is not None:
+                entry[1] = merge_sources(entry[1], u["source"])
+                entry[2] = entry[2] or u["url"]
+                score = _score_cell(u["score"])
+                if _score_rank(score) > _score_rank(entry[4]):
+                    entry[4], entry[5] = score, u["metric"]
+                write(target, f"C{entry[0]}", entry[1:])
+                merged += 1
+            elif target == table:
+                index["keys"][key] = [
+                    u["id"],
+                    u["source"],
+                    u["url"],
+                    u["raw_text"],
+                    _score_cell(u["score"]),
+                    u["metric"],
                 ]
-                for r in final_rows
-            ]
+                index["rows"][u["id"]] = key
+                write(table, f"B{u['id']}", [u["trend"]])
+                updated += 1
+                continue
+            else:
+                if not index["header"]:
+                    write(target, "A1", HEADER)
+                    index["header"] = True
+                row_number = index["next_row"]
+                index["next_row"] += 1
+                entry = [
+                    row_number,
+                    u["source"],
+                    u["url"],
+                    u["raw_text"],
+                    _score_cell(u["score"]),
+                    u["metric"],
+                ]
+                index["keys"][key] = entry
+                index["rows"][row_number] = key
+                write(target, f"A{row_number}", [u["date"], u["trend"]] + entry[1:])
+                row_counts[target] = max(row_counts.get(target, 0), row_number)
+                updated += 1
+            write(table, f"A{u['id']}", [""] * len(HEADER))
+            if table in self._backfill_indexes:
+                self._forget_backfill_row(self._backfill_indexes[table], u["id"])
+
+        self._ensure_row_capacity(worksheets, row_counts)
+        if data:
+            self._with_backoff(
+                self.sheet.values_batch_update,
+                {"valueInputOption": "RAW", "data": data},
+            )
+        return updated, merged
 
+    def _backfill_index(self, tab: str) -> Dict[str, Any]:
+        """
+        Rows of a tab a backfill may merge into: "keys" maps (date,
+        normalized trend) to [row_number, source, url, raw_text, score,
+        metric] and "rows" maps row numbers back to keys; "next_row" is the
+        first free row and "header" whether row 1 is written. Read once per
+        tab and kept up to date by update_extractions.
+        """
+        if tab not in self._backfill_indexes:
+            absolute_range_name = _lazy_import("gspread.utils").absolute_range_name
+            rows = self._with_backoff(
+                self.sheet.values_get, absolute_range_name(tab, "A1:G")
+            ).get("values", [])
+            keys, row_keys = {}, {}
+            for row_number, row in enumerate(rows[1:], start=2):
+                if len(row) < 2 or not row[0]:
+                    continue
+                row = row + [""] * (len(HEADER) - len(row))
+                key = (row[0], normalize_trend(row[1]))
+                keys[key] = (
+                    [row_number] + row[2:4] + [row[4], _score_cell(row[5]), row[6]]
+                )
+                row_keys[row_number] = key
+            self._backfill_indexes[tab] = {
+                "keys": keys,
+                "rows": row_keys,
+                "next_row": max(len(rows), 1) + 1,
+                "header": bool(rows),
+            }
+        return self._backfill_indexes[tab]
+
+    @staticmethod
+    def _forget_backfill_row(index: Dict[str, Any], row_number: int):
+        """Drops a row's key from a backfill index, if the key still names it."""
+        key = index["rows"].pop(row_number, None)
+        if key is not None and index["keys"].get(key, [None])[0] == row_number:
+            del index["keys"][key]
+
+    @staticmethod
+    def _tab_generation(tab: str) -> Optional[str]:
+        """The generation of a generation tab or of its archive tabs."""
+        for generation in GENERATION_TABS:
+            if tab == generation or re.fullmatch(
+                rf"{re.escape(generation)} \d{{4}}-\d{{2}}", tab
+            ):
+                return generation
+        return None
+
+    @staticmethod
+    def _parse_rows(rows: List[List[str]]) -> List[Dict[str, Any]]:
+        """Sheet rows as trend dicts, newest and highest-scoring first."""
+        trends = [
+            {
+                "date": row[0],
+                "trend": row[1],
+                "source": row[2] if len(row) > 2 else "",
+                "url": row[3] if len(row) > 3 else "",
+                "raw_text": row[4] if len(row) > 4 else "",
+                "score": int(row[5]) if len(row) > 5 and row[5].isdigit() else 0,
+                "metric": row[6] if len(row) > 6 else "",
+            }
+            for row in rows
+            if len(row) >= 2
+        ]
+        trends.sort(key=lambda t: (t["date"], t["score"]), reverse=True)
+        return trends
+
+    @staticmethod
+    def _split_expired(existing_rows: List[List[str]], cutoff: str):
+        """
+        Splits a tab into (header + rows to keep, expired trends), where a
+        trend is expired when its date is before cutoff.
+        """
+        hot_rows, expired = existing_rows[:1], []
+        for row in existing_rows[1:]:
+            if len(row) < 2 or not is_expired(row[0], cutoff):
+                hot_rows.append(row)
+                continue
+            row = row + [""] * (len(HEADER) - len(row))
+            expired.append(
+                TrendRecord(
+                    date=row[0],
+                    source=row[2],
+                    trend=row[1],
+                    url=row[3],
+                    raw_text=row[4],
+                    trend_score=int(row[5]) if str(row[5]).isdigit() else 0,
+                    metric_label=row[6],
+                )
+            )
+        return hot_rows, expired
+
+    def _with_backoff(self, fn, *args, **kwargs):
+        """
+        Calls a Sheets API function, retrying quota (429) and transient 5xx
+        errors with exponential backoff and jitter.
+        """
+        APIError = _lazy_import("gspread.exceptions").APIError
+        for attempt in range(SHEETS_MAX_RETRIES + 1):
             try:
-                # Clear and update
-                worksheet.clear()
-                worksheet.update(values=rows_to_write)
-                logger.info(
-                    f"Synced {tab_name}: {len(final_rows)} trends ({len(tab_new_trends)} new merged)."
+                with METRICS.timer("sheets_api", method=fn.__name__):
+                    return fn(*args, **kwargs)
+            except APIError as e:
+                if e.code not in RETRYABLE_STATUS or attempt == SHEETS_MAX_RETRIES:
+                    raise
+                METRICS.add("sheets_api_retries", method=fn.__name__, status=e.code)
+                delay = min(2**attempt, 64) + random.uniform(0, 1)
+                logger.warning(
+                    f"Sheets API returned {e.code}, retrying in {delay:.1f}s..."
                 )
-            except Exception as e:
-                logger.error(f"Failed to write to {tab_name}: {e}")
+                time.sleep(delay)
 
+    def _ensure_tabs(self, tabs: List[str], row_count: int = 1000) -> Dict[str, Any]:
+        """
+        Returns worksheets by title, creating missing tabs with row_count
+        rows in one request.
+        """
+        worksheets = {ws.title: ws for ws in self._with_backoff(self.sheet.worksheets)}
+        missing = [tab for tab in tabs if tab not in worksheets]
+        if missing:
+            self._with_backoff(
+                self.sheet.batch_update,
+                {
+                    "requests": [
+                        {
+                            "addSheet": {
+                                "properties": {
+                                    "title": tab,
+                                    "gridProperties": {
+                                        "rowCount": row_count,
+                                        "columnCount": len(HEADER),
+                                    },
+                                }
+                            }
+                        }
+                        for tab in missing
+                    ]
+                },
+            )
+            worksheets = {
+                ws.title: ws for ws in self._with_backoff(self.sheet.worksheets)
+            }
+        return worksheets
+
+    def _ensure_row_capacity(self, worksheets: Dict[str, Any], row_counts: Dict):
+        """Grows tabs whose grid is too small for the pending writes."""
+        grow_requests = [
+            {
+                "appendDimension": {
+                    "sheetId": worksheets[tab].id,
+                    "dimension": "ROWS",
+                    "length": rows - worksheets[tab].row_count,
+                }
+            }
+            for tab, rows in row_counts.items()
+            if rows > worksheets[tab].row_count
+        ]
+        if grow_requests:
+            self._with_backoff(self.sheet.batch_update, {"requests": grow_requests})
 
-def main():
-    fetcher = TrendFetcher()
-    trends = fetcher.get_all_trends()
+    def _plan_delta(
+        self, existing_rows: List[List[str]], tab_new_trends: List[Dict[str, Any]]
+    ):
+        """
+        Plans only this run's changes: a (date, normalized trend) -> row index
+        decides which trends are appended and which existing rows get their
+        Source/URL cells patched.
+        Returns ([(start_cell, values)], summary).
+        """
+        updates = []
+        if not existing_rows or len(existing_rows[0]) < len(HEADER):
+            # New tab, or add missing headers if updating old sheet
+            updates.append(("A1", [HEADER]))
+
+        # Key: (date, normalized_trend) -> [row_number, source, url]
+        index = {}
+        for row_number, row in enumerate(existing_rows[1:], start=2):
+            if len(row) < 2:
+                continue  # Skip malformed
+            row = row + [""] * (4 - len(row))
+            index[(row[0], normalize_trend(row[1]))] = [row_number, row[2], row[3]]
+
+        changed_rows = {}  # row_number -> [source, url]
+        new_rows = {}  # key -> row values
+        for t in tab_new_trends:
+            key = (t["date"], normalize_trend(t["trend"]))
+            if key in new_rows:
+                row = new_rows[key]
+                row[2] = merge_sources(row[2], t["source"])
+                if not row[3] and t["url"]:
+                    row[3] = t["url"]
+            elif key in index:
+                entry = index[key]
+                source = merge_sources(entry[1], t["source"])
+                url = entry[2] or t["url"]
+                if (source, url) != (entry[1], entry[2]):
+                    entry[1], entry[2] = source, url
+                    changed_rows[entry[0]] = [source, url]
+            else:
+                new_rows[key] = [
+                    t["date"],
+                    t["trend"],
+                    t["source"],
+                    t["url"],
+                    t["raw_text"],
+                    t.get("trend_score", 0),
+                    t.get("metric_label", ""),
+                ]
 
+        for row_number, values in changed_rows.items():
+            updates.append((f"C{row_number}", [values]))
+        if new_rows:
+            first_free_row = max(len(existing_rows), 1) + 1
+            updates.append((f"A{first_free_row}", list(new_rows.values())))
+
+        summary = (
+            f"{len(new_rows)} appended, {len(changed_rows)} updated "
+            f"({len(tab_new_trends)} new merged)."
+        )
+        return updates, summary
+
+    def _plan_rewrite(
+        self, existing_rows: List[List[str]], tab_new_trends: List[Dict[str, Any]]
+    ):
+        """
+        Merges the full tab in memory and plans one sorted overwrite of it.
+        Returns ([(start_cell, values)], summary).
+        """
+        if not existing_rows:
+            # Should at least have headers if newly created, but just in case
+            header = list(HEADER)
+        else:
+            header = existing_rows[0]
+            if len(header) < 7:
+                # Add missing headers if updating old sheet
+                header.extend(["Score", "Metric"])
+
+        # Combine and Deduplicate by (date, normalized trend): the first
+        # occurrence keeps its casing and URL, duplicates merge their Source
+        merged = TrendBatch.from_rows(existing_rows[1:]).merge(tab_new_trends)
+
+        # Sort by Date (descending) then Trend Score (descending)
+        rows_to_write = [header] + merged.rows(merged.sort_order())
+        # Blank out leftover rows (e.g. skipped malformed ones) instead of
+        # clearing the tab first, so a failed write never empties it.
+        rows_to_write += [[""] * len(HEADER)] * (
+            len(existing_rows) - len(rows_to_write)
+        )
+
+        summary = f"{len(merged)} trends ({len(tab_new_trends)} new merged)."
+        return [("A1", rows_to_write)], summary
+
+
+def create_backend(
+    name: str, db_path: str = DEFAULT_DB_PATH, retention_days: int = RETENTION_DAYS
+) -> StorageBackend:
+    if name == "sqlite":
+        return SQLiteBackend(db_path, retention_days)
+    return SheetWriter(retention_days)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch, classify and store trends.")
+    parser.add_argument(
+        "--backend",
+        choices=["sheets", "sqlite"],
+        default=os.environ.get("STORAGE_BACKEND", "sheets"),
+        help="Where to store trends (default: sheets).",
+    )
+    parser.add_argument(
+        "--db-path", default=DEFAULT_DB_PATH, help="SQLite database file."
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=RETENTION_DAYS,
+        help="Days kept in the generation tabs before rows move to monthly "
+        "archives (0 disables archiving).",
+    )
+    parser.add_argument(
+        "--no-model",
+        action="store_true",
+        help="Skip the sentence-transformers model and use heuristics only.",
+    )
+    parser.add_argument(
+        "--embedding-classifier",
+        action="store_true",
+        help="Route trends by similarity to generation seed phrases, "
+        "falling back to keywords below the confidence threshold.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll each source on its own interval "
+        "(see sources.json) until SIGTERM.",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Seconds the sources may run before what was collected is synced, "
+        "per daemon tick in --daemon mode (default: run_deadline in sources.json).",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Instead of fetching, re-run topic extraction and classification "
+        "over every stored row (Sheets tabs, archive tabs included, or the "
+        "SQLite tables). Resumes from the last checkpoint if interrupted.",
+    )
+    parser.add_argument(
+        "--backfill-workers",
+        type=int,
+        default=None,
+        help="Backfill worker processes (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--backfill-chunk",
+        type=int,
+        default=BACKFILL_CHUNK_SIZE,
+        help="Rows per backfill chunk and write (transaction or batchUpdate).",
+    )
+    parser.add_argument(
+        "--backfill-checkpoint",
+        default=DEFAULT_CHECKPOINT_PATH,
+        help="Where backfill progress is saved.",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=DEFAULT_SNAPSHOT_DIR,
+        help="Where to publish the gzip JSON snapshot for the read path "
+        "(empty to skip).",
+    )
+    parser.add_argument(
+        "--report",
+        default=DEFAULT_REPORT_PATH,
+        help="Where to write the JSON run report.",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=DEFAULT_TEXTFILE_PATH,
+        help="Also write run metrics for the Prometheus textfile collector "
+        "(e.g. /var/lib/node_exporter/run_metrics.prom).",
+    )
+    return parser.parse_args(argv)
+
+
+def write_run_report(args, trends: List[Dict[str, Any]]):
+    """Writes the JSON report and, if configured, the Prometheus textfile."""
+    for phase, secs in STARTUP_TIMINGS.items():
+        METRICS.add("startup_seconds", secs, phase=phase)
+    for t in trends:
+        METRICS.add("trends_synced", generation=t.get("generation", "General"))
+    try:
+        METRICS.write_json(
+            args.report,
+            {"backend": args.backend, "model": not args.no_model},
+        )
+        if args.metrics_textfile:
+            METRICS.write_prometheus(args.metrics_textfile)
+    except OSError as e:
+        logger.error(f"Failed to write run report: {e}")
+
+
+def sync_batch(
+    trends: List[Dict[str, Any]],
+    writer: StorageBackend,
+    history: "TrendHistory",
+    snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Merges one batch of fetched trends, syncs it and the Rising ranking and
+    publishes the read-path snapshot. Returns the merged trends and whether
+    the store committed them.
+    """
     # Debug: Log source breakdown
     source_counts = {}
     for t in trends:
@@ -560,12 +1757,110 @@ def main():
         source_counts[s] = source_counts.get(s, 0) + 1
     logger.info(f"Fetched trends breakdown: {source_counts}")
 
-    classifier = TrendClassifier()
-    for t in trends:
-        t["generation"] = classifier.classify(t["raw_text"])
-    writer = SheetWriter()
+    # Merge near-duplicates across sources before syncing
+    with METRICS.timer("stage", stage="dedup"):
+        trends = _lazy_import("dedup").cluster_trends(trends)
+
+    # Update the per-trend score series and rank what is accelerating
+    with METRICS.timer("stage", stage="history"):
+        history.update(trends)
+        rising = history.rising()
+
+    with METRICS.timer("stage", stage="sync"):
+        synced = writer.sync_trends(trends)
+        writer.sync_rising(rising)
+    history.save()
+
+    if snapshot_dir and writer.connected:
+        with METRICS.timer("stage", stage="snapshot"):
+            try:
+                tabs = writer.read_trends_many(GENERATION_TABS, limit=SNAPSHOT_TOP_N)
+                tabs[RISING_TAB] = rising
+                publish_snapshot(tabs, snapshot_dir)
+            except Exception as e:
+                logger.error(f"Failed to publish snapshot: {e}")
+    return trends, synced
+
+
+def backfill(args):
+    """Re-extracts and re-classifies the rows already in the store."""
+    writer = create_backend(args.backend, args.db_path, args.retention_days)
     writer.connect()
-    writer.sync_trends(trends)
+    if not writer.connected:
+        logger.error(f"Backfill needs a connected {writer.name} store.")
+        return
+    try:
+        with METRICS.timer("stage", stage="backfill"):
+            run_backfill(
+                writer,
+                use_model=not args.no_model,
+                embedding_classifier=args.embedding_classifier,
+                workers=args.backfill_workers,
+                chunk_size=args.backfill_chunk,
+                checkpoint_path=args.backfill_checkpoint,
+            )
+    finally:
+        writer.close()
+    write_run_report(args, [])
+
+
+def main():
+    STARTUP_TIMINGS["module import"] = time.perf_counter() - _MODULE_START
+    args = parse_args()
+    if args.backfill:
+        backfill(args)
+        return
+    fetcher = TrendFetcher(use_model=not args.no_model)
+
+    def encoder(texts):
+        # Cleaned titles match the texts embedded during extraction,
+        # so most of these lookups are embedding cache hits.
+        return fetcher.embed([fetcher.clean_title(t) for t in texts])
+
+    use_embeddings = args.embedding_classifier and fetcher.model
+    classifier = TrendClassifier(encoder=encoder if use_embeddings else None)
+
+    writer = create_backend(args.backend, args.db_path, args.retention_days)
+    writer.connect()
+    history = _lazy_import("history").TrendHistory()
+
+    def deliver(trends: List[Dict[str, Any]]):
+        trends, synced = sync_batch(trends, writer, history, args.snapshot_dir)
+        fetcher.save_caches(synced)
+        write_run_report(args, trends)
+
+    if args.daemon:
+        # Stop after the current poll on SIGTERM / Ctrl-C
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda signum, frame: stop.set())
+        log_startup_timings()
+        run_daemon(
+            fetcher,
+            classifier,
+            deliver,
+            stop,
+            max_workers=fetcher.config["max_concurrency"],
+            deadline=args.deadline,
+        )
+    else:
+        # Stream sources -> extraction -> classification into the sink buffer
+        trends = []
+        fetcher.start_run(args.deadline)
+        try:
+            with METRICS.timer("stage", stage="fetch"):
+                run_pipeline(
+                    fetcher,
+                    classifier,
+                    trends.extend,
+                    max_workers=fetcher.config["max_concurrency"],
+                )
+        finally:
+            # Whatever was collected is committed, even if the run broke off
+            log_startup_timings()
+            deliver(trends)
+
+    writer.close()
     logger.info("Done.")
 
 
@@ -0,0 +1,194 @@
+import io
+import os
+import json
+import logging
+import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from paths import DEFAULT_CACHE_DIR, atomic_write
+from storage import normalize_trend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.environ.get(
+    "TREND_HISTORY_PATH", os.path.join(DEFAULT_CACHE_DIR, "history")
+)
+# Days of daily scores kept per trend
+HISTORY_DAYS = 30
+# Days the velocity slope is fitted over
+VELOCITY_WINDOW = 7
+
+RISING_HEADER = [
+    "Date",
+    "Trend",
+    "Generation",
+    "Velocity",
+    "Acceleration",
+    "Score",
+    "Days Seen",
+]
+
+
+class TrendHistory:
+    """
+    Rolling daily score series of every normalized trend.
+    Scores live in one (trends, days) float32 matrix whose last column is
+    end_date; a run shifts the window forward and writes its scores in
+    place, so updates cost O(new trends) instead of re-reading all history.
+    Trends with no score left in the window are dropped on save.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, days: int = HISTORY_DAYS):
+        self.path = path
+        self.days = days
+        self.end_date = None
+        self.rows: Dict[str, int] = {}  # normalized trend -> matrix row
+        self.labels: List[List[str]] = []  # row -> [display trend, generation]
+        self.scores = np.zeros((0, days), dtype=np.float32)
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.path, "index.json")
+
+    @property
+    def _scores_path(self) -> str:
+        return os.path.join(self.path, "scores.npy")
+
+    def _load(self):
+        if not os.path.exists(self._index_path):
+            return
+        try:
+            with open(self._index_path) as f:
+                index = json.load(f)
+            scores = np.load(self._scores_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable trend history: {e}")
+            return
+        if index.get("days") != self.days or len(scores) != len(index["keys"]):
+            logger.info("Trend history settings changed, starting fresh.")
+            return
+        if index["end_date"]:
+            self.end_date = datetime.date.fromisoformat(index["end_date"])
+        self.rows = {key: row for row, key in enumerate(index["keys"])}
+        self.labels = index["labels"]
+        self.scores = scores
+
+    def _advance(self, date: datetime.date):
+        """Shifts the window so that its last column is date."""
+        if self.end_date is None:
+            self.end_date = date
+            return
+        shift = (date - self.end_date).days
+        if shift <= 0:
+            return
+        if shift >= self.days:
+            self.scores[:] = 0
+        else:
+            self.scores[:, :-shift] = self.scores[:, shift:]
+            self.scores[:, -shift:] = 0
+        self.end_date = date
+
+    def update(self, trends: List[Dict[str, Any]]):
+        """
+        Records the scores of this run's trends.
+        A trend reported several times on one day keeps its highest score.
+        """
+        if not trends:
+            return
+        dates = [datetime.date.fromisoformat(t["date"]) for t in trends]
+        self._advance(max(dates))
+
+        new_keys = []
+        row_ids, columns, values = [], [], []
+        for t, date in zip(trends, dates):
+            column = self.days - 1 - (self.end_date - date).days
+            if column < 0:
+                continue  # Older than the window
+            key = normalize_trend(t["trend"])
+            row = self.rows.get(key)
+            if row is None:
+                row = self.rows[key] = len(self.labels)
+                self.labels.append([t["trend"], t.get("generation", "General")])
+                new_keys.append(key)
+            else:
+                self.labels[row][1] = t.get("generation", self.labels[row][1])
+            row_ids.append(row)
+            columns.append(column)
+            values.append(float(t.get("trend_score", 0) or 0))
+
+        if new_keys:
+            grown = np.zeros((len(new_keys), self.days), dtype=np.float32)
+            self.scores = np.vstack([self.scores, grown])
+        np.maximum.at(
+            self.scores,
+            (np.array(row_ids, dtype=np.intp), np.array(columns, dtype=np.intp)),
+            np.array(values, dtype=np.float32),
+        )
+
+    def velocity(self):
+        """
+        Returns (velocity, acceleration) arrays aligned with the matrix rows.
+        Velocity is the least-squares slope of log1p(score) per day over the
+        last VELOCITY_WINDOW days; acceleration is how much that slope grew
+        since the previous day's window.
+        """
+        window = min(VELOCITY_WINDOW, self.days - 1)
+        x = np.arange(window, dtype=np.float32)
+        weights = (x - x.mean()) / ((x - x.mean()) ** 2).sum()
+        log_scores = np.log1p(self.scores)
+        velocity = log_scores[:, -window:] @ weights
+        previous = log_scores[:, -window - 1 : -1] @ weights
+        return velocity, velocity - previous
+
+    def rising(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """Trends scored on the last day, fastest-growing first."""
+        if not len(self.scores):
+            return []
+        velocity, acceleration = self.velocity()
+        today = self.scores[:, -1]
+        candidates = np.flatnonzero((today > 0) & (velocity > 0))
+        order = candidates[
+            np.lexsort((-acceleration[candidates], -velocity[candidates]))
+        ]
+        days_seen = (self.scores > 0).sum(axis=1)
+        keys = list(self.rows)
+        return [
+            {
+                "date": self.end_date.isoformat(),
+                "trend": self.labels[row][0],
+                "norm_trend": keys[row],
+                "generation": self.labels[row][1],
+                "velocity": round(float(velocity[row]), 4),
+                "acceleration": round(float(acceleration[row]), 4),
+                "score": int(today[row]),
+                "days_seen": int(days_seen[row]),
+            }
+            for row in order[:limit]
+        ]
+
+    def save(self):
+        """Drops trends that left the window and writes the store atomically."""
+        keep = self.scores.any(axis=1)
+        if not keep.all():
+            keys = [key for key, kept in zip(self.rows, keep) if kept]
+            self.labels = [label for label, kept in zip(self.labels, keep) if kept]
+            self.scores = self.scores[keep]
+            self.rows = {key: row for row, key in enumerate(keys)}
+
+        scores = io.BytesIO()
+        np.save(scores, self.scores)
+        atomic_write(self._scores_path, scores.getvalue())
+        atomic_write(
+            self._index_path,
+            json.dumps(
+                {
+                    "days": self.days,
+                    "end_date": self.end_date.isoformat() if self.end_date else None,
+                    "keys": list(self.rows),
+                    "labels": self.labels,
+                }
+            ),
+        )
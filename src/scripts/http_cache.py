@@ -0,0 +1,88 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from paths import DEFAULT_CACHE_DIR, atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    """
+    On-disk cache for conditional GETs.
+    Per URL it keeps the ETag/Last-Modified validators, the raw body and the
+    parsed payload, so a 304 response can skip parsing entirely.
+    """
+
+    def __init__(self, path: str = os.path.join(DEFAULT_CACHE_DIR, "http")):
+        self.path = path
+        self.not_modified = 0
+        self.fetched = 0
+        self._lock = threading.Lock()
+
+    def _base(self, url: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url, empty if nothing is cached."""
+        try:
+            with open(self._base(url) + ".json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str, parse: Callable[[bytes], Any]) -> Optional[Any]:
+        """
+        Returns the cached parsed payload, re-parsing the stored body if the
+        parsed copy is missing or unreadable.
+        """
+        base = self._base(url)
+        try:
+            with open(base + ".pickle", "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+        try:
+            with open(base + ".body", "rb") as f:
+                return parse(f.read())
+        except Exception:
+            return None
+
+    def store(self, url: str, headers: Any, body: bytes, parsed: Any):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return  # Nothing to revalidate with next time
+        base = self._base(url)
+        try:
+            atomic_write(base + ".body", body)
+            atomic_write(base + ".pickle", pickle.dumps(parsed))
+            # Validators last: they only point at a complete body/payload
+            atomic_write(
+                base + ".json",
+                json.dumps(
+                    {"url": url, "etag": etag, "last_modified": last_modified}
+                ).encode("utf-8"),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache response for {url}: {e}")
+
+    def record(self, not_modified: bool):
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+            else:
+                self.fetched += 1
+
+    def stats(self) -> str:
+        return f"{self.not_modified} not modified, {self.fetched} fetched"
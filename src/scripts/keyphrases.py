@@ -0,0 +1,102 @@
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Candidate embeddings kept per run before the vocabulary starts over
+MAX_CANDIDATES = 20000
+
+
+class CandidateVocabulary:
+    """
+    Run-wide n-gram candidates and their L2-normalized embeddings.
+    Each distinct n-gram is embedded once per run and gets a fixed row in
+    one growing matrix (capacity doubles, so adding rows is amortized O(1)).
+    Titles refer to their candidates by row.
+    """
+
+    def __init__(self, max_size: int = MAX_CANDIDATES):
+        self.max_size = max_size
+        self.rows: Dict[str, int] = {}
+        self.phrases: List[str] = []
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._matrix[: len(self)]
+
+    def missing(self, grams: List[str]) -> List[str]:
+        """Distinct grams without a row yet, in first-seen order."""
+        return [gram for gram in dict.fromkeys(grams) if gram not in self.rows]
+
+    def add(self, grams: List[str], embeddings: np.ndarray):
+        """Adds rows for grams not in the vocabulary; embeddings are normalized."""
+        if not grams:
+            return
+        if self._matrix is None:
+            self._matrix = np.empty(
+                (max(len(grams), 1024), embeddings.shape[1]), dtype=np.float32
+            )
+        needed = len(self) + len(grams)
+        if needed > len(self._matrix):
+            grown = np.empty(
+                (max(needed, 2 * len(self._matrix)), self._matrix.shape[1]),
+                dtype=np.float32,
+            )
+            grown[: len(self)] = self.embeddings
+            self._matrix = grown
+        self._matrix[len(self) : needed] = embeddings
+        for gram in grams:
+            self.rows[gram] = len(self.phrases)
+            self.phrases.append(gram)
+
+    def clear(self):
+        self.rows, self.phrases, self._matrix = {}, [], None
+
+    def lookup(self, grams: List[str]) -> np.ndarray:
+        return np.fromiter(
+            (self.rows[g] for g in grams), dtype=np.intp, count=len(grams)
+        )
+
+
+def normalize(embeddings) -> np.ndarray:
+    embeddings = np.array(embeddings, dtype=np.float32)
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    return embeddings
+
+
+def extract_topics(
+    texts: List[str],
+    analyzer: Callable[[str], List[str]],
+    embed: Callable[[List[str]], np.ndarray],
+    vocabulary: CandidateVocabulary,
+) -> List[Optional[str]]:
+    """
+    KeyBERT-like topic of every text from a shared vocabulary.
+    Texts and the candidates the vocabulary has not embedded yet go through
+    one embed call; each text then scores its candidate rows against its
+    own embedding and keeps the most similar one. Texts without candidates
+    (too short or all stop words) get None.
+    """
+    grams = [list(dict.fromkeys(analyzer(text))) for text in texts]
+    all_grams = [g for text_grams in grams for g in text_grams]
+    if not all_grams:
+        return [None] * len(texts)
+    new = vocabulary.missing(all_grams)
+    if len(vocabulary) + len(new) > vocabulary.max_size:
+        # Long daemon runs: start over rather than grow without bound
+        vocabulary.clear()
+        new = vocabulary.missing(all_grams)
+    embeddings = normalize(embed(list(texts) + new))
+    vocabulary.add(new, embeddings[len(texts) :])
+
+    topics = []
+    for i, text_grams in enumerate(grams):
+        if not text_grams:
+            topics.append(None)
+            continue
+        candidates = vocabulary.embeddings[vocabulary.lookup(text_grams)]
+        topics.append(text_grams[int(np.argmax(candidates @ embeddings[i]))])
+    return topics
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from paths import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_PATH = os.environ.get(
+    "TREND_REPORT_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "run_report.json"),
+)
+# Prometheus node_exporter textfile collector output; off unless set
+DEFAULT_TEXTFILE_PATH = os.environ.get("TREND_METRICS_TEXTFILE")
+
+PROMETHEUS_PREFIX = "trend_pulse_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RunMetrics:
+    """
+    Thread-safe counters collected over one run.
+    Every metric is a sum keyed by name and labels, e.g.
+    add("http_response_bytes", 5120, host="www.reddit.com").
+    timer(name) adds elapsed seconds to "<name>_seconds" and one to
+    "<name>_count", so averages and throughput can be derived later.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, Labels], float] = {}
+        self.started = time.time()
+
+    def add(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(f"{name}_seconds", time.perf_counter() - start, **labels)
+            self.add(f"{name}_count", 1, **labels)
+
+    def get(self, name: str, **labels) -> float:
+        """Sum of a metric over every label set matching labels."""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(
+                value
+                for (metric, metric_labels), value in self._values.items()
+                if metric == name and wanted <= set(metric_labels)
+            )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in items
+        ]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+        self.started = time.time()
+
+    def report(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """The run as a JSON-serializable dict, with derived throughputs."""
+        throughput = {}
+        for name in ("classify", "extract_topics", "model_encode"):
+            seconds = self.get(f"{name}_seconds")
+            if seconds:
+                throughput[f"{name}_texts_per_second"] = round(
+                    self.get(f"{name}_texts") / seconds, 1
+                )
+        return {
+            "started": self.started,
+            "duration_seconds": round(time.time() - self.started, 3),
+            **(extra or {}),
+            "throughput": throughput,
+            "metrics": self.snapshot(),
+        }
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        atomic_write(path, json.dumps(self.report(extra), indent=2) + "\n")
+        logger.info(f"Run report written to {path}")
+
+    def write_prometheus(self, path: str):
+        """
+        Writes every metric as a gauge in the text exposition format.
+        The file is replaced atomically, as the textfile collector requires.
+        """
+        lines = []
+        typed = set()
+        metrics = self.snapshot() + [
+            {"name": "last_run_timestamp_seconds", "labels": {}, "value": time.time()},
+            {
+                "name": "run_duration_seconds",
+                "labels": {},
+                "value": time.time() - self.started,
+            },
+        ]
+        for metric in metrics:
+            name = PROMETHEUS_PREFIX + metric["name"]
+            if name not in typed:
+                lines.append(f"# TYPE {name} gauge")
+                typed.add(name)
+            labels = ",".join(
+                f'{k}="{_escape_label(v)}"' for k, v in metric["labels"].items()
+            )
+            labels = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}{labels} {metric['value']}")
+        atomic_write(path, "\n".join(lines) + "\n")
+        logger.info(f"Prometheus metrics written to {path}")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide metrics of the current run
+METRICS = RunMetrics()
@@ -0,0 +1,23 @@
+import os
+import threading
+from typing import Union
+
+# Run-to-run state: HTTP and embedding caches, circuit breaker, seen Reddit
+# posts, score history and backfill checkpoints
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TREND_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".cache")
+)
+
+
+def atomic_write(path: str, content: Union[str, bytes]):
+    """
+    Writes content to path through a temporary file and os.replace, so
+    readers never see a partial file. Creates missing parent directories.
+    The temporary name includes the thread id, so threads can write the
+    same path concurrently.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb" if isinstance(content, bytes) else "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,132 @@
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed between stages
+
+
+def _batches(q: queue.Queue, batch_size: int, max_wait: float) -> Iterator[List]:
+    """
+    Yields lists of items from q until the end marker.
+    A partial batch is flushed once no new item arrived for max_wait seconds,
+    so downstream stages keep working while slow sources are still running.
+    """
+    batch = []
+    while True:
+        try:
+            item = q.get(timeout=max_wait if batch else None)
+        except queue.Empty:
+            yield batch
+            batch = []
+            continue
+        if item is _DONE:
+            if batch:
+                yield batch
+            return
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+
+def run_pipeline(
+    fetcher,
+    classifier,
+    sink: Callable[[List[Dict[str, Any]]], Any],
+    batch_size: int = 64,
+    max_queue: int = 256,
+    max_wait: float = 0.5,
+    max_workers: int = 16,
+    sources: Optional[List[Tuple[str, Callable[[], Iterator]]]] = None,
+) -> int:
+    """
+    Streams records from every fetcher source into sink:
+
+        sources (thread pool) -> topic extraction -> classification -> sink
+
+    Stages are connected by bounded queues, so slow sources overlap with
+    model work and at most max_queue items wait between two stages.
+    sink is called from the calling thread with each classified batch.
+    sources defaults to every source of the fetcher.
+    Returns the number of records delivered.
+    """
+    if sources is None:
+        sources = fetcher.sources()
+    items_q: queue.Queue = queue.Queue(maxsize=max_queue)
+    records_q: queue.Queue = queue.Queue(maxsize=max(1, max_queue // batch_size))
+    classified_q: queue.Queue = queue.Queue(maxsize=max(1, max_queue // batch_size))
+
+    def produce(name: str, factory: Callable[[], Iterator]):
+        try:
+            with METRICS.timer("source", source=name):
+                for item in factory():
+                    METRICS.add("source_items", source=name)
+                    items_q.put(item)
+        except Exception as e:
+            METRICS.add("source_errors", source=name)
+            logger.error(f"Source {name} failed: {e}")
+
+    def produce_all():
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(sources)))
+        ) as pool:
+            for name, factory in sources:
+                pool.submit(produce, name, factory)
+        items_q.put(_DONE)
+
+    def extract():
+        for batch in _batches(items_q, batch_size, max_wait):
+            pending = [item for item in batch if item.needs_topic]
+            try:
+                if pending:
+                    topics = fetcher.extract_topics(
+                        [item.record["raw_text"] for item in pending],
+                        [item.entry for item in pending],
+                    )
+                    for item, topic in zip(pending, topics):
+                        item.record["trend"] = topic
+            except Exception as e:
+                logger.error(f"Topic extraction stage failed: {e}")
+            records_q.put([item.record for item in batch])
+        records_q.put(_DONE)
+
+    def classify():
+        while True:
+            records = records_q.get()
+            if records is _DONE:
+                break
+            try:
+                results = classifier.classify_many([r["raw_text"] for r in records])
+                for record, result in zip(records, results):
+                    record["generation"] = result["generation"]
+            except Exception as e:
+                logger.error(f"Classification stage failed: {e}")
+                for record in records:
+                    record.setdefault("generation", "General")
+            classified_q.put(records)
+        classified_q.put(_DONE)
+
+    stages = [
+        threading.Thread(target=target, name=f"pipeline-{target.__name__}")
+        for target in (produce_all, extract, classify)
+    ]
+    for stage in stages:
+        stage.start()
+
+    delivered = 0
+    while True:
+        records = classified_q.get()
+        if records is _DONE:
+            break
+        sink(records)
+        delivered += len(records)
+
+    for stage in stages:
+        stage.join()
+    return delivered
@@ -0,0 +1,221 @@
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from storage import merge_sources, normalize_trend
+
+
+class TrendRecord:
+    """
+    One fetched trend.
+    Fixed __slots__ instead of a per-item dict, and the low-cardinality
+    fields (date, source, metric_label, generation) are interned so every
+    record of a run shares one string object per distinct value.
+    Supports the dict-style access (record["trend"], record.get(...)) that
+    pipeline stages and storage backends use, so it can stand in for the
+    plain dicts those accept.
+    """
+
+    __slots__ = (
+        "date",
+        "source",
+        "trend",
+        "url",
+        "raw_text",
+        "trend_score",
+        "metric_label",
+        "generation",
+    )
+    _INTERNED = frozenset({"date", "source", "metric_label", "generation"})
+
+    def __init__(
+        self,
+        date: str,
+        source: str,
+        trend: str,
+        url: str = "",
+        raw_text: str = "",
+        trend_score: int = 0,
+        metric_label: str = "",
+        generation: Optional[str] = None,
+    ):
+        self.date = sys.intern(date)
+        self.source = sys.intern(source)
+        self.trend = trend
+        self.url = url
+        self.raw_text = raw_text
+        self.trend_score = trend_score
+        self.metric_label = sys.intern(metric_label)
+        self.generation = sys.intern(generation) if generation else None
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        if key in self._INTERNED and isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self) -> List[str]:
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+
+    def copy(self) -> "TrendRecord":
+        return TrendRecord(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"TrendRecord({self.to_dict()!r})"
+
+
+class TrendBatch:
+    """
+    Columnar trends: scores in one NumPy array, every other field in a
+    parallel list. Sorting, filtering and merging move index arrays around
+    instead of building a dict per row. NumPy is imported by the methods
+    that need it, so importing this module stays cheap.
+    """
+
+    COLUMNS = ("date", "trend", "source", "url", "raw_text", "metric_label")
+
+    def __init__(self, columns: Dict[str, List[Any]], scores: "np.ndarray"):
+        self.columns = columns
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "TrendBatch":
+        """From TrendRecords or trend dicts."""
+        import numpy as np
+
+        records = list(records)
+        columns = {name: [r.get(name) or "" for r in records] for name in cls.COLUMNS}
+        scores = np.array(
+            [r.get("trend_score", 0) or 0 for r in records], dtype=np.int64
+        )
+        return cls(columns, scores)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[Any]]) -> "TrendBatch":
+        """
+        From sheet rows in HEADER order (Date, Trend, Source, URL, Raw Text,
+        Score, Metric); rows with fewer than five cells are skipped.
+        """
+        import numpy as np
+
+        rows = [row for row in rows if len(row) >= 5]
+        columns = {
+            name: [row[i] for row in rows]
+            for i, name in enumerate(("date", "trend", "source", "url", "raw_text"))
+        }
+        columns["metric_label"] = [row[6] if len(row) > 6 else "" for row in rows]
+        scores = np.array(
+            [
+                int(row[5]) if len(row) > 5 and str(row[5]).isdigit() else 0
+                for row in rows
+            ],
+            dtype=np.int64,
+        )
+        return cls(columns, scores)
+
+    def take(self, indices: Any) -> "TrendBatch":
+        """The rows at indices (an index array or boolean mask), in that order."""
+        import numpy as np
+
+        indices = np.arange(len(self))[indices]
+        return TrendBatch(
+            {
+                name: [values[i] for i in indices]
+                for name, values in self.columns.items()
+            },
+            self.scores[indices],
+        )
+
+    def sort_order(self) -> "np.ndarray":
+        """
+        Row indices by newest date first, then highest score; ties keep
+        their order. Dates are ISO strings, so they sort as text.
+        """
+        import numpy as np
+
+        _, date_rank = np.unique(
+            np.array(self.columns["date"], dtype=str), return_inverse=True
+        )
+        return np.lexsort((-self.scores, -date_rank.ravel()))
+
+    def sorted(self) -> "TrendBatch":
+        return self.take(self.sort_order())
+
+    def merge(self, new: Iterable[Any]) -> "TrendBatch":
+        """
+        Deduplicates by (date, normalized trend) and appends new trends
+        (records or dicts) not already present. The first occurrence of a
+        key keeps its casing and URL; later duplicates from new merge their
+        sources into it and fill its URL if it had none, duplicates within
+        this batch are dropped.
+        """
+        import numpy as np
+
+        columns = self.columns
+        index = {}
+        keep = []
+        for i, key in enumerate(
+            zip(columns["date"], map(normalize_trend, columns["trend"]))
+        ):
+            if key not in index:
+                index[key] = len(keep)
+                keep.append(i)
+        merged = self if len(keep) == len(self) else self.take(keep)
+        columns = {name: list(values) for name, values in merged.columns.items()}
+
+        added_scores = []
+        for t in new:
+            key = (t["date"], normalize_trend(t["trend"]))
+            i = index.get(key)
+            if i is not None:
+                columns["source"][i] = merge_sources(columns["source"][i], t["source"])
+                if not columns["url"][i] and t["url"]:
+                    columns["url"][i] = t["url"]
+                continue
+            index[key] = len(columns["date"])
+            for name in self.COLUMNS:
+                columns[name].append(t.get(name) or "")
+            added_scores.append(t.get("trend_score", 0) or 0)
+        scores = np.concatenate([merged.scores, np.array(added_scores, dtype=np.int64)])
+        return TrendBatch(columns, scores)
+
+    def rows(self, order: Optional[Iterable[int]] = None) -> List[List[Any]]:
+        """Sheet rows in HEADER order, optionally in the given row order."""
+        c = self.columns
+        rows = [
+            [date, trend, source, url, raw_text, score, metric]
+            for date, trend, source, url, raw_text, score, metric in zip(
+                c["date"],
+                c["trend"],
+                c["source"],
+                c["url"],
+                c["raw_text"],
+                self.scores.tolist(),
+                c["metric_label"],
+            )
+        ]
+        return rows if order is None else [rows[i] for i in order]
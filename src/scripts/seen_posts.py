@@ -0,0 +1,74 @@
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from paths import DEFAULT_CACHE_DIR, atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEN_PATH = os.path.join(DEFAULT_CACHE_DIR, "reddit_seen.json")
+# Post IDs remembered per subreddit; hot listings rarely reach further back
+MAX_SEEN_PER_KEY = 5000
+
+
+class SeenPosts:
+    """
+    IDs of posts already ingested, per subreddit, oldest first.
+    Each key keeps at most max_per_key IDs. Nothing is written until save();
+    the caller saves once the batch holding the posts is stored and calls
+    discard_pending() instead when the sync failed, so those posts are
+    picked up again next time. path=None keeps the set in memory only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_SEEN_PATH,
+        max_per_key: int = MAX_SEEN_PER_KEY,
+    ):
+        self.path = path
+        self.max_per_key = max_per_key
+        self._lock = threading.Lock()
+        self._seen: Dict[str, "OrderedDict[str, None]"] = {}
+        # (key, post_id) added since the last save() or discard_pending()
+        self._pending: List[Tuple[str, str]] = []
+        if path is None:
+            return
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._seen = {key: OrderedDict.fromkeys(ids) for key, ids in saved.items()}
+
+    def add(self, key: str, post_id: str) -> bool:
+        """Records post_id under key; returns False if it was already seen."""
+        with self._lock:
+            seen = self._seen.setdefault(key, OrderedDict())
+            if post_id in seen:
+                return False
+            seen[post_id] = None
+            self._pending.append((key, post_id))
+            if len(seen) > self.max_per_key:
+                seen.popitem(last=False)
+            return True
+
+    def discard_pending(self):
+        """Forgets the IDs added since the last save()."""
+        with self._lock:
+            for key, post_id in self._pending:
+                self._seen[key].pop(post_id, None)
+            self._pending = []
+
+    def save(self):
+        with self._lock:
+            self._pending = []
+            if self.path is None:
+                return
+            data = json.dumps({key: list(ids) for key, ids in self._seen.items()})
+        try:
+            atomic_write(self.path, data)
+        except OSError as e:
+            logger.warning(f"Failed to save seen Reddit posts: {e}")
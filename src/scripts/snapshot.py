@@ -0,0 +1,73 @@
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, List
+
+from paths import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = os.environ.get(
+    "TREND_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(__file__), "data", "snapshot"),
+)
+# Trends kept per generation, newest and highest-scoring first
+SNAPSHOT_TOP_N = 200
+
+MANIFEST = "manifest.json"
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def publish_snapshot(
+    tabs: Dict[str, List[Dict[str, Any]]], path: str = DEFAULT_SNAPSHOT_DIR
+) -> Dict[str, Any]:
+    """
+    Writes one gzip-compressed JSON file per tab (<slug>.json.gz) plus
+    manifest.json mapping each tab to its file, row count and ETag.
+    Rows are written in the order given, so pass them pre-sorted and
+    truncated. The ETag is a hash of the uncompressed JSON; files whose
+    hash is unchanged are not rewritten, and the manifest version only
+    increases when some tab changed. Returns the manifest.
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest_path = os.path.join(path, MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {"version": 0, "tabs": {}}
+
+    entries = {}
+    for name, rows in tabs.items():
+        body = json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode()
+        etag = hashlib.sha256(body).hexdigest()[:16]
+        filename = f"{_slug(name)}.json.gz"
+        entries[name] = {"file": filename, "etag": etag, "count": len(rows)}
+        if previous["tabs"].get(name, {}).get("etag") == etag and os.path.exists(
+            os.path.join(path, filename)
+        ):
+            continue
+        # mtime=0 keeps the gzip bytes identical for identical content
+        atomic_write(os.path.join(path, filename), gzip.compress(body, mtime=0))
+
+    changed = entries != previous["tabs"]
+    manifest = {
+        "version": previous["version"] + 1 if changed else previous["version"],
+        "generated": (
+            time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            if changed
+            else previous.get("generated")
+        ),
+        "tabs": entries,
+    }
+    if changed:
+        atomic_write(manifest_path, json.dumps(manifest, indent=2).encode())
+        logger.info(f"Published snapshot v{manifest['version']} to {path}")
+    return manifest
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+SOURCES_PATH = os.environ.get(
+    "TREND_SOURCES_PATH", os.path.join(os.path.dirname(__file__), "sources.json")
+)
+
+# Used for hosts without an entry in the "hosts" section
+DEFAULT_HOST_LIMITS = {"max_concurrent": 2, "min_interval": 0.0}
+
+# Item limits of sources that don't set "limit"
+DEFAULT_LIMITS = {"google_trends": 20, "pytrends": 20, "rss": 10, "reddit": 25}
+
+# Daemon poll interval in seconds of sources that don't set "interval"
+DEFAULT_INTERVALS = {
+    "google_trends": 15 * 60,
+    "pytrends": 15 * 60,
+    "rss": 60 * 60,
+    "reddit": 30 * 60,
+}
+
+
+# Listing pages a subreddit may fetch per run when it doesn't set "pages";
+# "limit" is the page size (at most 100)
+DEFAULT_REDDIT_PAGES = 4
+
+# Flairs that name a post category rather than a topic; posts with these
+# get a topic extracted from their title, other flairs are the topic
+DEFAULT_GENERIC_FLAIRS = [
+    "Advice",
+    "Discussion",
+    "Humor",
+    "Meme",
+    "Mod Post",
+    "News",
+    "Other",
+    "Political",
+    "Politics",
+    "Poll",
+    "Question",
+    "Rant",
+    "Serious",
+    "Vent",
+]
+
+# Seconds each source may spend per run, retries included, when it doesn't
+# set "budget". The run deadline still caps every budget.
+DEFAULT_BUDGETS = {"google_trends": 30, "pytrends": 45, "rss": 20, "reddit": 30}
+
+# Run-wide settings used when sources.json doesn't set them
+DEFAULT_SETTINGS = {
+    "max_concurrency": 16,
+    # Seconds after which remaining sources are cut off and what was
+    # collected is synced
+    "run_deadline": 300,
+    # Upper bound in seconds on every connect / read
+    "request_timeout": 10,
+    # Consecutive failed runs before a source is skipped, and for how long
+    "circuit_breaker": {"failures": 3, "cooldown": 30 * 60},
+}
+
+
+def load_sources(path: str = SOURCES_PATH) -> Dict[str, Any]:
+    """
+    Reads the source registry: Google Trends geos, pytrends geos, RSS feeds
+    and subreddits, each with an item limit, plus per-host rate limits, the
+    global concurrency cap and run deadline. Missing limits, time budgets,
+    daemon poll intervals and Reddit paging settings get the defaults above.
+    """
+    with open(path) as f:
+        config = json.load(f)
+    for kind, limit in DEFAULT_LIMITS.items():
+        defaults = {
+            "limit": limit,
+            "interval": DEFAULT_INTERVALS[kind],
+            "budget": DEFAULT_BUDGETS[kind],
+        }
+        if kind == "reddit":
+            defaults["pages"] = DEFAULT_REDDIT_PAGES
+            defaults["generic_flairs"] = DEFAULT_GENERIC_FLAIRS
+        config[kind] = [{**defaults, **source} for source in config.get(kind, [])]
+    for key, value in DEFAULT_SETTINGS.items():
+        config.setdefault(key, value)
+    config.setdefault("hosts", {})
+    return config
+
+
+class HostLimiter:
+    """
+    Per-host rate limits: at most max_concurrent requests in flight and
+    request starts spaced at least min_interval seconds apart.
+    hosts maps a host name (or "default") to those two settings.
+    """
+
+    def __init__(self, hosts: Dict[str, Dict[str, Any]] = None):
+        hosts = hosts or {}
+        self.default = {**DEFAULT_HOST_LIMITS, **hosts.get("default", {})}
+        self.hosts = {
+            host: {**self.default, **limits}
+            for host, limits in hosts.items()
+            if host != "default"
+        }
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def limits(self, host: str) -> Dict[str, Any]:
+        return self.hosts.get(host, self.default)
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlparse(url).netloc
+        limits = self.limits(host)
+        with self._lock:
+            slot = self._slots.setdefault(
+                host, threading.BoundedSemaphore(limits["max_concurrent"])
+            )
+        with slot:
+            if limits["min_interval"]:
+                # Reserve the next start time, then wait for it outside the lock
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_start.get(host, now))
+                    self._next_start[host] = start + limits["min_interval"]
+                time.sleep(start - now)
+            yield
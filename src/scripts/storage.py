@@ -0,0 +1,394 @@
+import os
+import re
+import sqlite3
+import datetime
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.environ.get(
+    "TREND_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "trends.db")
+)
+# Days of trends kept in the hot tabs / table. Older rows are moved into
+# per-month archive partitions; 0 keeps everything hot.
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "30"))
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+def retention_cutoff(
+    days: int = RETENTION_DAYS, today: Optional[datetime.date] = None
+) -> Optional[str]:
+    """ISO date before which trends are archived, or None without retention."""
+    if days <= 0:
+        return None
+    today = today or datetime.date.today()
+    return (today - datetime.timedelta(days=days)).isoformat()
+
+
+def is_expired(date: str, cutoff: Optional[str]) -> bool:
+    # Rows with unparseable dates stay hot rather than vanish into an archive
+    return bool(cutoff) and bool(_ISO_DATE.match(date or "")) and date < cutoff
+
+
+def archive_month(date: str) -> str:
+    """Archive partition of a date, e.g. "2026-09"."""
+    return date[:7]
+
+
+def normalize_trend(trend: str) -> str:
+    return trend.lower().strip()
+
+
+def merge_sources(existing: str, new_source: str) -> str:
+    """Merges comma-separated source lists into one sorted, de-duplicated list."""
+    sources = set([s.strip() for s in existing.split(",") if s.strip()])
+    sources.update(s.strip() for s in new_source.split(",") if s.strip())
+    return ", ".join(sorted(list(sources)))
+
+
+class StorageBackend:
+    """
+    Interface for trend stores.
+    Backends deduplicate by (generation, date, normalized trend) and merge
+    the Source field of duplicates.
+    """
+
+    name = "base"
+
+    def connect(self):
+        pass
+
+    @property
+    def connected(self) -> bool:
+        return True
+
+    def sync_trends(self, trends: List[Dict[str, Any]]) -> bool:
+        """
+        Stores a batch of trends. Errors are logged rather than raised;
+        returns True only once the batch is committed.
+        """
+        raise NotImplementedError
+
+    def read_trends(
+        self, generation: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Returns stored trends of a generation, newest first."""
+        raise NotImplementedError
+
+    def read_trends_many(
+        self, generations: List[str], limit: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """read_trends for several generations; backends may batch the reads."""
+        return {
+            generation: self.read_trends(generation, limit)
+            for generation in generations
+        }
+
+    def read_archive(self, generation: str, month: str) -> List[Dict[str, Any]]:
+        """Returns archived trends of a generation for one month ("YYYY-MM")."""
+        raise NotImplementedError
+
+    def sync_rising(self, rising: List[Dict[str, Any]]):
+        """Replaces the stored "Rising" ranking (see history.TrendHistory)."""
+        pass
+
+    # Backfill support (see backfill.run_backfill)
+
+    @property
+    def store_id(self) -> str:
+        """Identifies the stored data, so a checkpoint only resumes on it."""
+        raise NotImplementedError
+
+    def backfill_tables(self) -> List[str]:
+        """Tables (or tabs) holding stored trends, in backfill order."""
+        raise NotImplementedError
+
+    def read_chunk(self, table: str, after: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Up to limit rows of table with id > after, by id, with their id,
+        generation, date, trend, source and raw_text.
+        """
+        raise NotImplementedError
+
+    def update_extractions(
+        self, table: str, updates: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """Writes back re-extracted rows; returns (updated, merged) counts."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Local SQLite store with a unique index on (generation, date, norm_trend).
+    Each sync is one bulk upsert transaction; duplicate keys merge their
+    sources and keep the first URL. The same transaction moves trends older
+    than retention_days into trends_archive, indexed by (generation, month).
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS trends (
+            id INTEGER PRIMARY KEY,
+            generation TEXT NOT NULL,
+            date TEXT NOT NULL,
+            trend TEXT NOT NULL,
+            norm_trend TEXT NOT NULL,
+            source TEXT NOT NULL DEFAULT '',
+            url TEXT NOT NULL DEFAULT '',
+            raw_text TEXT NOT NULL DEFAULT '',
+            score INTEGER NOT NULL DEFAULT 0,
+            metric TEXT NOT NULL DEFAULT ''
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS trends_key
+            ON trends (generation, date, norm_trend);
+        CREATE TABLE IF NOT EXISTS trends_archive (
+            id INTEGER PRIMARY KEY,
+            generation TEXT NOT NULL,
+            date TEXT NOT NULL,
+            month TEXT NOT NULL,
+            trend TEXT NOT NULL,
+            norm_trend TEXT NOT NULL,
+            source TEXT NOT NULL DEFAULT '',
+            url TEXT NOT NULL DEFAULT '',
+            raw_text TEXT NOT NULL DEFAULT '',
+            score INTEGER NOT NULL DEFAULT 0,
+            metric TEXT NOT NULL DEFAULT ''
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS trends_archive_key
+            ON trends_archive (generation, date, norm_trend);
+        CREATE INDEX IF NOT EXISTS trends_archive_month
+            ON trends_archive (generation, month);
+        CREATE TABLE IF NOT EXISTS rising (
+            rank INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            trend TEXT NOT NULL,
+            generation TEXT NOT NULL,
+            velocity REAL NOT NULL,
+            acceleration REAL NOT NULL,
+            score INTEGER NOT NULL,
+            days_seen INTEGER NOT NULL
+        );
+    """
+
+    UPSERT = """
+        INSERT INTO trends
+            (generation, date, trend, norm_trend, source, url, raw_text, score, metric)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (generation, date, norm_trend) DO UPDATE SET
+            source = merge_sources(trends.source, excluded.source),
+            url = CASE WHEN trends.url = '' THEN excluded.url ELSE trends.url END
+    """
+
+    ARCHIVE = """
+        INSERT INTO trends_archive
+            (generation, date, month, trend, norm_trend, source, url, raw_text,
+             score, metric)
+        SELECT generation, date, substr(date, 1, 7), trend, norm_trend, source,
+            url, raw_text, score, metric
+        FROM trends WHERE date < ?
+        ON CONFLICT (generation, date, norm_trend) DO UPDATE SET
+            source = merge_sources(trends_archive.source, excluded.source)
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_DB_PATH, retention_days: int = RETENTION_DAYS
+    ):
+        self.path = path
+        self.retention_days = retention_days
+        self.conn = None
+
+    def connect(self):
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.create_function("merge_sources", 2, merge_sources, deterministic=True)
+        self.conn.executescript(self.SCHEMA)
+
+    @property
+    def connected(self) -> bool:
+        return self.conn is not None
+
+    def sync_trends(self, trends: List[Dict[str, Any]]) -> bool:
+        rows = [
+            (
+                t.get("generation", "General"),
+                t["date"],
+                t["trend"],
+                normalize_trend(t["trend"]),
+                t["source"],
+                t["url"] or "",
+                t["raw_text"] or "",
+                t.get("trend_score", 0),
+                t.get("metric_label", ""),
+            )
+            for t in trends
+        ]
+        cutoff = retention_cutoff(self.retention_days)
+        archived = 0
+        try:
+            with self.conn:
+                self.conn.executemany(self.UPSERT, rows)
+                if cutoff:
+                    self.conn.execute(self.ARCHIVE, (cutoff,))
+                    archived = self.conn.execute(
+                        "DELETE FROM trends WHERE date < ?", (cutoff,)
+                    ).rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write to SQLite store {self.path}: {e}")
+            return False
+        if archived:
+            logger.info(f"Archived {archived} trends older than {cutoff}.")
+
+        counts = {}
+        for row in rows:
+            counts[row[0]] = counts.get(row[0], 0) + 1
+        for generation, count in counts.items():
+            METRICS.add("sqlite_rows_upserted", count, generation=generation)
+            logger.info(f"Synced {generation}: {count} trends upserted.")
+        return True
+
+    def sync_rising(self, rising: List[Dict[str, Any]]):
+        rows = [
+            (
+                rank,
+                r["date"],
+                r["trend"],
+                r["generation"],
+                r["velocity"],
+                r["acceleration"],
+                r["score"],
+                r["days_seen"],
+            )
+            for rank, r in enumerate(rising, start=1)
+        ]
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM rising")
+                self.conn.executemany(
+                    "INSERT INTO rising VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write rising trends to {self.path}: {e}")
+            return
+        logger.info(f"Synced Rising: {len(rows)} trends.")
+
+    def read_trends(
+        self, generation: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        cursor = self.conn.execute(
+            """
+            SELECT date, trend, source, url, raw_text, score, metric
+            FROM trends WHERE generation = ?
+            ORDER BY date DESC, score DESC
+            LIMIT ?
+            """,
+            (generation, -1 if limit is None else limit),
+        )
+        columns = ["date", "trend", "source", "url", "raw_text", "score", "metric"]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def read_archive(self, generation: str, month: str) -> List[Dict[str, Any]]:
+        cursor = self.conn.execute(
+            """
+            SELECT date, trend, source, url, raw_text, score, metric
+            FROM trends_archive WHERE generation = ? AND month = ?
+            ORDER BY date DESC, score DESC
+            """,
+            (generation, month),
+        )
+        columns = ["date", "trend", "source", "url", "raw_text", "score", "metric"]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    # Tables holding stored trends, in backfill order
+    TABLES = ("trends", "trends_archive")
+
+    @property
+    def store_id(self) -> str:
+        return os.path.abspath(self.path)
+
+    def backfill_tables(self) -> List[str]:
+        return list(self.TABLES)
+
+    def read_chunk(self, table: str, after: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Up to limit rows of table with id > after, by id. Paging by id
+        instead of OFFSET keeps every chunk an index range scan.
+        """
+        assert table in self.TABLES
+        cursor = self.conn.execute(
+            f"""
+            SELECT id, generation, date, trend, source, raw_text
+            FROM {table} WHERE id > ? ORDER BY id LIMIT ?
+            """,
+            (after, limit),
+        )
+        columns = ["id", "generation", "date", "trend", "source", "raw_text"]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def update_extractions(self, table: str, updates: List[Dict[str, Any]]):
+        """
+        Rewrites the trend and generation of rows by id, in one transaction.
+        A row whose new key collides with another row merges its sources
+        (and URL, if the other has none) into that row and is deleted, as
+        an upsert would have done; the higher score and its metric are
+        kept. Returns (updated, merged) counts.
+        """
+        assert table in self.TABLES
+        updated = merged = 0
+        with self.conn:
+            for u in updates:
+                norm_trend = normalize_trend(u["trend"])
+                cursor = self.conn.execute(
+                    f"""
+                    UPDATE OR IGNORE {table}
+                    SET trend = ?, norm_trend = ?, generation = ? WHERE id = ?
+                    """,
+                    (u["trend"], norm_trend, u["generation"], u["id"]),
+                )
+                if cursor.rowcount:
+                    updated += 1
+                    continue
+                row = self.conn.execute(
+                    f"SELECT date, source, url, score, metric FROM {table} WHERE id = ?",
+                    (u["id"],),
+                ).fetchone()
+                if row is None:
+                    continue  # Merged away since it was read
+                date, source, url, score, metric = row
+                self.conn.execute(
+                    f"""
+                    UPDATE {table} SET
+                        source = merge_sources(source, ?),
+                        url = CASE WHEN url = '' THEN ? ELSE url END,
+                        metric = CASE WHEN score < ? THEN ? ELSE metric END,
+                        score = MAX(score, ?)
+                    WHERE generation = ? AND date = ? AND norm_trend = ?
+                    """,
+                    (
+                        source,
+                        url,
+                        score,
+                        metric,
+                        score,
+                        u["generation"],
+                        date,
+                        norm_trend,
+                    ),
+                )
+                self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (u["id"],))
+                merged += 1
+        return updated, merged
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
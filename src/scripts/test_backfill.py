@@ -0,0 +1,102 @@
+from fake_sheets import FakeSpreadsheet
+from get_trends import HEADER, SheetWriter
+from storage import SQLiteBackend
+
+
+def row(title: str, source: str = "RSS", url: str = "", score: int = 5):
+    return ["2026-10-01", title, source, url, title, score, f"{score} pts"]
+
+
+def make_writer(rows) -> SheetWriter:
+    sheet = FakeSpreadsheet()
+    sheet.load("Gen Z", [HEADER] + rows)
+    writer = SheetWriter()
+    writer.sheet = sheet
+    return writer
+
+
+def renamed(chunk_row, trend: str, generation: str = "Gen Z"):
+    return dict(chunk_row, trend=trend, generation=generation)
+
+
+def test_read_chunk_pages_past_blank_rows():
+    writer = make_writer([[""] * 7] * 3 + [row("Fanum Tax"), row("Skibidi")])
+    ids = []
+    chunk = writer.read_chunk("Gen Z", 0, 2)
+    while chunk:
+        ids += [r["id"] for r in chunk]
+        chunk = writer.read_chunk("Gen Z", chunk[-1]["id"], 2)
+    assert ids == [5, 6]
+
+
+def test_same_tab_rename_merges_into_matching_row():
+    writer = make_writer(
+        [
+            row("Fanum Tax", url="https://a"),
+            row("Old Topic", source="Reddit (r/GenZ)", score=9),
+        ]
+    )
+    chunk = writer.read_chunk("Gen Z", 0, 10)
+    assert writer.update_extractions("Gen Z", [renamed(chunk[1], "fanum tax")]) == (
+        0,
+        1,
+    )
+    rows = writer.sheet.worksheets()[0].rows
+    assert rows[1][:7] == [
+        "2026-10-01",
+        "Fanum Tax",
+        "RSS, Reddit (r/GenZ)",
+        "https://a",
+        "Fanum Tax",
+        9,
+        "9 pts",
+    ]
+    assert not any(rows[2])
+
+
+def test_same_tab_rename_frees_the_old_trend():
+    writer = make_writer([row("Alpha"), row("Beta")])
+    chunk = writer.read_chunk("Gen Z", 0, 10)
+    updates = [renamed(chunk[0], "Gamma"), renamed(chunk[1], "Alpha")]
+    assert writer.update_extractions("Gen Z", updates) == (2, 0)
+    rows = writer.sheet.worksheets()[0].rows
+    assert [r[1] for r in rows[1:]] == ["Gamma", "Alpha"]
+
+
+def test_moved_row_is_not_a_merge_target():
+    writer = make_writer([row("Alpha"), row("Beta")])
+    chunk = writer.read_chunk("Gen Z", 0, 10)
+    updates = [renamed(chunk[0], "Alpha", "Millennials"), renamed(chunk[1], "Alpha")]
+    assert writer.update_extractions("Gen Z", updates) == (2, 0)
+    tabs = {ws.title: ws.rows for ws in writer.sheet.worksheets()}
+    assert [r[1] for r in tabs["Millennials"][1:]] == ["Alpha"]
+    assert [r[1] for r in tabs["Gen Z"][1:]] == ["", "Alpha"]
+
+
+def test_sqlite_merge_keeps_higher_score():
+    backend = SQLiteBackend(":memory:")
+    backend.connect()
+    for title, score in (("Fanum Tax", 5), ("Old Topic", 9)):
+        backend.sync_trends(
+            [
+                {
+                    "date": "2026-10-01",
+                    "source": "RSS",
+                    "trend": title,
+                    "url": "",
+                    "raw_text": title,
+                    "trend_score": score,
+                    "metric_label": f"{score} pts",
+                    "generation": "Gen Z",
+                }
+            ]
+        )
+    chunk = backend.read_chunk("trends", 0, 10)
+    assert backend.update_extractions("trends", [renamed(chunk[1], "fanum tax")]) == (
+        0,
+        1,
+    )
+    rows = backend.read_trends("Gen Z")
+    assert [(r["trend"], r["score"], r["metric"]) for r in rows] == [
+        ("Fanum Tax", 9, "9 pts")
+    ]
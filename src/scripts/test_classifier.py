@@ -0,0 +1,15 @@
+from get_trends import TrendClassifier
+
+
+def test_keywords_match_whole_words_only():
+    classifier = TrendClassifier()
+    assert classifier.classify("Learning the alphabet with flashcards") == "General"
+    assert classifier.classify("Sigma and alpha memes take over") == "Gen Alpha"
+
+
+def test_keywords_match_plurals():
+    classifier = TrendClassifier()
+    assert classifier.classify("Why ipad kids can't read") == "Gen Alpha"
+    results = classifier.classify_many(["Zoomers love this", "Millennials and rent"])
+    assert [r["generation"] for r in results] == ["Gen Z", "Millennials"]
+    assert [r["matches"] for r in results] == [["zoomer"], ["millennial"]]
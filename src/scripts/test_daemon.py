@@ -0,0 +1,28 @@
+import threading
+
+from daemon import run_daemon
+from get_trends import SourceItem, TrendClassifier
+from records import TrendRecord
+
+
+def test_each_tick_uses_the_deadline_override(make_fetcher):
+    fetcher = make_fetcher()
+    record = TrendRecord(date="2026-10-01", source="RSS", trend="Fanum Tax")
+    fetcher.scheduled_sources = lambda: [
+        ("RSS: Example", lambda: iter([SourceItem(record)]), 60)
+    ]
+    deadlines = []
+    start_run = fetcher.start_run
+    fetcher.start_run = lambda deadline=None: (
+        deadlines.append(deadline),
+        start_run(deadline),
+    )
+    stop = threading.Event()
+
+    def deliver(trends):
+        assert trends[0]["generation"]
+        stop.set()
+
+    run_daemon(fetcher, TrendClassifier(), deliver, stop, deadline=42)
+    assert deadlines == [42]
+    assert fetcher.deadline.seconds == 42
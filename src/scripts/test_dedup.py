@@ -0,0 +1,34 @@
+from dedup import cluster_trends
+
+
+def trend(title: str, generation: str, source: str, score: int) -> dict:
+    return {
+        "date": "2026-10-01",
+        "trend": title,
+        "source": source,
+        "url": "",
+        "trend_score": score,
+        "generation": generation,
+    }
+
+
+def test_merges_near_duplicates_of_one_generation():
+    merged = cluster_trends(
+        [
+            trend("Taylor Swift Tour", "Gen Z", "RSS", 10),
+            trend("taylor swift tour dates", "Gen Z", "Google Trends", 50),
+        ]
+    )
+    assert len(merged) == 1
+    assert merged[0]["trend"] == "taylor swift tour dates"
+    assert merged[0]["source"] == "Google Trends, RSS"
+
+
+def test_keeps_near_duplicates_of_different_generations():
+    merged = cluster_trends(
+        [
+            trend("Skibidi Toilet Movie", "Gen Alpha", "RSS", 10),
+            trend("skibidi toilet movie", "General", "Google Trends", 5000),
+        ]
+    )
+    assert sorted(t["generation"] for t in merged) == ["Gen Alpha", "General"]
@@ -0,0 +1,78 @@
+import json
+
+from conftest import FakeResponse
+from get_trends import TrendClassifier
+from pipeline import run_pipeline
+
+
+def listing(posts, after=None) -> FakeResponse:
+    children = [
+        {
+            "data": {
+                "name": name,
+                "title": title,
+                "link_flair_text": flair,
+                "score": 5,
+                "permalink": f"/r/GenZ/comments/{name}",
+            }
+        }
+        for name, title, flair in posts
+    ]
+    body = {"data": {"children": children, "after": after}}
+    return FakeResponse(200, json.dumps(body).encode())
+
+
+def reddit_trends(fetcher) -> dict:
+    """Streams r/GenZ through the pipeline; records by title."""
+    trends = []
+    run_pipeline(
+        fetcher,
+        TrendClassifier(),
+        trends.extend,
+        sources=[("Reddit", lambda: fetcher.iter_reddit("GenZ"))],
+    )
+    return {t["raw_text"]: t for t in trends}
+
+
+def test_specific_flair_is_the_stored_topic(make_fetcher):
+    posts = [
+        ("t3_a", "She Dropped A Surprise Album Overnight", "Taylor Swift"),
+        ("t3_b", "Senate Passes Tax Bill", "Political"),
+        ("t3_c", "Rant About Mondays", "Rant"),
+    ]
+    fetcher = make_fetcher([listing(posts)])
+    extracted = []
+    extract_topics = fetcher.extract_topics
+
+    def recording_extract(titles, entries=None):
+        extracted.extend(titles)
+        return extract_topics(titles, entries)
+
+    fetcher.extract_topics = recording_extract
+    trends = reddit_trends(fetcher)
+
+    flaired = trends["She Dropped A Surprise Album Overnight"]
+    assert flaired["trend"] == "Taylor Swift"
+    assert flaired["source"] == "Reddit flair (r/GenZ)"
+    # Generic flairs name a category, so those posts are extracted instead
+    assert trends["Senate Passes Tax Bill"]["trend"] != "Political"
+    assert trends["Rant About Mondays"]["trend"] != "Rant"
+    assert sorted(extracted) == ["Rant About Mondays", "Senate Passes Tax Bill"]
+
+
+def test_skips_seen_posts_and_follows_cursor(make_fetcher):
+    replies = [
+        listing(
+            [("t3_a", "First Post Title", ""), ("t3_b", "Second Post Title", "")],
+            after="t3_b",
+        ),
+        listing([("t3_c", "Third Post Title", "")], after="t3_c"),
+        listing([("t3_c", "Third Post Title", "")]),
+    ]
+    fetcher = make_fetcher(replies)
+    fetcher.seen_posts.add("GenZ", "t3_a")
+    items = list(fetcher.iter_reddit("GenZ", pages=4))
+    titles = [item.record["raw_text"] for item in items]
+    assert titles == ["Second Post Title", "Third Post Title"]
+    # The third page had nothing new, which ends the walk
+    assert fetcher.session.calls == 3
@@ -0,0 +1,91 @@
+import os
+from unittest import mock
+
+from requests import exceptions
+
+from budget import Budget, CircuitBreaker
+from conftest import FakeResponse
+from get_trends import HTTP_MAX_RETRIES
+
+
+def test_retries_503_then_succeeds(make_fetcher):
+    fetcher = make_fetcher([FakeResponse(503), FakeResponse(200, b"ok")])
+    with mock.patch("get_trends.time.sleep") as sleep:
+        resp = fetcher._get("https://example.com/feed")
+    assert resp.status_code == 200
+    assert fetcher.session.calls == 2
+    assert sleep.call_count == 1
+    assert not fetcher._source.failed
+
+
+def test_retries_connection_error_then_succeeds(make_fetcher):
+    replies = [exceptions.ConnectionError("reset"), FakeResponse(200)]
+    fetcher = make_fetcher(replies)
+    with mock.patch("get_trends.time.sleep"):
+        resp = fetcher._get("https://example.com/feed")
+    assert resp.status_code == 200
+    assert not fetcher._source.failed
+
+
+def test_gives_up_after_max_retries(make_fetcher):
+    fetcher = make_fetcher([FakeResponse(429)] * (HTTP_MAX_RETRIES + 1))
+    with mock.patch("get_trends.time.sleep"):
+        resp = fetcher._get("https://example.com/feed")
+    assert resp.status_code == 429
+    assert fetcher.session.calls == HTTP_MAX_RETRIES + 1
+    assert fetcher._source.failed
+
+
+def test_exhausted_budget_raises_without_request(make_fetcher):
+    fetcher = make_fetcher([FakeResponse(200)])
+    fetcher._source.budget = Budget(0)
+    try:
+        fetcher._get("https://example.com/feed")
+    except exceptions.Timeout:
+        pass
+    else:
+        raise AssertionError("expected Timeout")
+    assert fetcher.session.calls == 0
+    assert fetcher._source.failed
+
+
+def test_no_retry_when_budget_too_short(make_fetcher):
+    fetcher = make_fetcher([FakeResponse(503), FakeResponse(200)])
+    fetcher._source.budget = Budget(60)
+    # Every backoff delay exceeds what is left of the budget
+    with mock.patch("get_trends.random.uniform", return_value=120):
+        resp = fetcher._get("https://example.com/feed")
+    assert resp.status_code == 503
+    assert fetcher.session.calls == 1
+
+
+def test_circuit_opens_after_failures_and_persists(tmp_path):
+    path = os.path.join(tmp_path, "circuits.json")
+    circuits = CircuitBreaker(path=path, failures=2, cooldown=60)
+    circuits.record("RSS: Example", ok=False)
+    assert circuits.allow("RSS: Example")
+    circuits.record("RSS: Example", ok=False)
+    assert not circuits.allow("RSS: Example")
+    circuits.save()
+    assert not CircuitBreaker(path=path, failures=2).allow("RSS: Example")
+    circuits.record("RSS: Example", ok=True)
+    assert circuits.allow("RSS: Example")
+
+
+def test_iter_source_counts_failed_empty_run(make_fetcher):
+    fetcher = make_fetcher([FakeResponse(500)] * (HTTP_MAX_RETRIES + 1))
+    fetcher.circuits.failures = 1
+
+    def factory():
+        if fetcher._get("https://example.com/feed").status_code == 200:
+            yield "item"
+
+    with mock.patch("get_trends.time.sleep"):
+        assert list(fetcher.iter_source("RSS: Example", 60, factory)) == []
+    assert not fetcher.circuits.allow("RSS: Example")
+
+
+def test_budget_never_outlasts_parent():
+    parent = Budget(1)
+    assert Budget(60, parent=parent).deadline == parent.deadline
+    assert Budget(0, parent=parent).expired()
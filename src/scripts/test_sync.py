@@ -0,0 +1,76 @@
+import os
+
+from fake_sheets import FakeSpreadsheet
+from get_trends import GENERATION_TABS, HEADER, SheetWriter, sync_batch
+from history import TrendHistory
+from seen_posts import SeenPosts
+from storage import SQLiteBackend
+
+
+class FailingSpreadsheet(FakeSpreadsheet):
+    def values_batch_update(self, body):
+        raise RuntimeError("quota exceeded")
+
+
+def trend(title: str, generation: str = "Gen Z", source: str = "RSS"):
+    return {
+        "date": "2026-10-01",
+        "source": source,
+        "trend": title,
+        "url": "",
+        "raw_text": title,
+        "trend_score": 10,
+        "metric_label": "",
+        "generation": generation,
+    }
+
+
+def make_writer(sheet: FakeSpreadsheet) -> SheetWriter:
+    for tab in GENERATION_TABS:
+        sheet.load(tab, [HEADER])
+    writer = SheetWriter(retention_days=0)
+    writer.sheet = sheet
+    return writer
+
+
+def test_sheet_sync_merges_duplicates():
+    writer = make_writer(FakeSpreadsheet())
+    assert writer.sync_trends([trend("Fanum Tax")])
+    assert writer.sync_trends([trend("fanum tax", source="Reddit")])
+    rows = writer.read_trends("Gen Z")
+    assert [(r["trend"], r["source"]) for r in rows] == [("Fanum Tax", "RSS, Reddit")]
+    assert writer.sheet.calls["values_batch_update"] == 2
+
+
+def test_sheet_sync_reports_failure():
+    writer = make_writer(FailingSpreadsheet())
+    assert not writer.sync_trends([trend("Fanum Tax")])
+    assert not SheetWriter().sync_trends([trend("Fanum Tax")])  # Not connected
+
+
+def test_sqlite_sync_reports_success(tmp_path):
+    backend = SQLiteBackend(os.path.join(tmp_path, "trends.db"), retention_days=0)
+    backend.connect()
+    assert backend.sync_trends([trend("Fanum Tax")])
+    backend.close()
+
+
+def test_seen_posts_saved_only_after_sync(tmp_path, make_fetcher):
+    fetcher = make_fetcher()
+    seen_path = os.path.join(tmp_path, "seen.json")
+    fetcher.seen_posts = SeenPosts(path=seen_path)
+    history = TrendHistory(path=os.path.join(tmp_path, "history.json"))
+
+    fetcher.seen_posts.add("GenZ", "t3_a")
+    writer = make_writer(FailingSpreadsheet())
+    _, synced = sync_batch([trend("Fanum Tax")], writer, history, snapshot_dir=None)
+    fetcher.save_caches(synced)
+    assert not synced
+    assert not os.path.exists(seen_path)
+    assert fetcher.seen_posts.add("GenZ", "t3_a")  # Fetched again next run
+
+    writer = make_writer(FakeSpreadsheet())
+    _, synced = sync_batch([trend("Fanum Tax")], writer, history, snapshot_dir=None)
+    fetcher.save_caches(synced)
+    assert synced
+    assert not SeenPosts(path=seen_path).add("GenZ", "t3_a")